@@ -36,8 +36,10 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'jobs.ratelimit.RateLimitMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'jobs.profiles.ProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -61,6 +63,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'hired_go.wsgi.application'
+ASGI_APPLICATION = 'hired_go.asgi.application'
 
 
 # Database
@@ -77,6 +80,51 @@ DATABASES = {
 }
 
 
+# Cache
+# HIREDGO_CACHE selects 'locmem' (default, also the test stand-in), 'file' or 'redis'.
+
+CACHE_BACKEND = os.environ.get('HIREDGO_CACHE', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('HIREDGO_CACHE_DIR', os.path.join(BASE_DIR, 'cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'hiredgo',
+        }
+    }
+
+# Sessions and the per-request User and profile lookups (jobs.profiles) are
+# served from the cache when it is shared between workers. The locmem cache
+# is per process, so a logout or deactivation in one worker would not be seen
+# by the others; there both stay on the database.
+if CACHE_BACKEND == 'locmem':
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTH_CACHE_TIMEOUT = 0
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    AUTH_CACHE_TIMEOUT = 300
+
+# ModelBackend stays listed so sessions created before the switch keep working.
+AUTHENTICATION_BACKENDS = [
+    'jobs.profiles.CachedModelBackend',
+    'django.contrib.auth.backends.ModelBackend',
+]
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
 
@@ -122,4 +170,93 @@ STATICFILES_DIRS = [
 MEDIA_ROOT = os.path.join(BASE_DIR, 'jobs/media')
 MEDIA_URL = '/media/'
 
+# Uploads are stored by content hash in MEDIA_ROOT/ab/cd/<sha256>.<ext>, so
+# identical files are kept once. Set SENDFILE_HEADER to 'X-Accel-Redirect'
+# (nginx, with an internal location at SENDFILE_URL aliased to MEDIA_ROOT) or
+# 'X-Sendfile' (Apache) to let the web server stream media files.
+DEFAULT_FILE_STORAGE = 'jobs.storage.ContentAddressedStorage'
+SENDFILE_HEADER = os.environ.get('HIREDGO_SENDFILE_HEADER')
+SENDFILE_URL = '/protected-media/'
+
 LOGIN_REDIRECT_URL = '/'
+
+# Uploaded images are staged here and validated/normalised by a pool of
+# UPLOAD_WORKERS background threads (0 processes them inline after commit).
+# Run the recover_uploads command from cron to finish uploads a restart left
+# pending.
+UPLOAD_STAGING_DIR = os.path.join(BASE_DIR, 'jobs/staging')
+UPLOAD_WORKERS = int(os.environ.get('HIREDGO_UPLOAD_WORKERS', 4))
+UPLOAD_MAX_DIMENSION = 1600
+
+# Thumbnails are rendered once per (image, size, format) and served with a
+# far-future, immutable Cache-Control header; uploads always get new names.
+THUMBNAIL_SIZES = {
+    'small': (90, 70),
+    'medium': (200, 200),
+    'large': (350, 250),
+}
+THUMBNAIL_MAX_AGE = 60 * 60 * 24 * 365
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '60/minute',
+        'user': '600/minute',
+    },
+}
+
+JOB_BOARD_PAGE_SIZE = 25
+JOB_BOARD_MAX_PAGE_SIZE = 100
+
+# Full-text search: 'postgres' or 'inverted_index'; chosen from the database vendor when unset.
+JOB_SEARCH_BACKEND = None
+JOB_SEARCH_CONFIG = 'english'
+JOB_SEARCH_MAX_RESULTS = 1000
+
+JOB_FACET_CACHE_TIMEOUT = 300
+# Facet counts of closed vacancies change rarely and are kept longer.
+JOB_FACET_HISTORY_TIMEOUT = 3600
+JOB_FRAGMENT_CACHE_TIMEOUT = 600
+# Seconds a shared proxy may serve an anonymous job detail page without revalidating.
+JOB_DETAIL_MAX_AGE = 60
+
+EXPORT_CHUNK_SIZE = 2000
+# Under ASGI exports are written to a temporary file before sending; this many
+# bytes are kept in memory before it moves to disk.
+EXPORT_SPOOL_MEMORY = 1024 * 1024
+
+# Job recommendations for applicants (jobs.recommendations). NumPy is used
+# for scoring when installed, with a pure-Python fallback.
+RECOMMENDATION_COUNT = 10
+RECOMMENDATION_HISTORY = 50
+RECOMMENDATION_CACHE_TIMEOUT = 600
+RECOMMENDATION_MAX_AGE = 3600
+# Seconds of vacancy updates re-read on each refresh, for transactions that
+# commit out of order.
+RECOMMENDATION_SYNC_OVERLAP = 60
+
+# Ranking of applicants for recruiters (jobs.ranking). Scores are stored on
+# Application by the score_applications command; run it from cron every few
+# minutes. Recency decays with the half-life below (days), so scores older
+# than RANKING_RESCORE_AFTER seconds are recomputed.
+RANKING_WEIGHTS = {'skills': 0.6, 'experience': 0.25, 'recency': 0.15}
+RANKING_RECENCY_HALF_LIFE = 14
+RANKING_RESCORE_AFTER = 24 * 60 * 60
+
+# Throttling of login, signup and apply POSTs (jobs.ratelimit), per client IP
+# and per account: scope -> {kind: (requests, sliding window in seconds)}. Counters
+# live in the RATE_LIMIT_CACHE alias; use a shared cache (HIREDGO_CACHE=redis)
+# when running several workers. Behind a proxy, set RATE_LIMIT_IP_HEADER, e.g.
+# 'HTTP_X_FORWARDED_FOR', and RATE_LIMIT_TRUSTED_PROXIES to the number of
+# proxies in front of the app that append to it.
+RATE_LIMITS = {
+    'login': {'ip': (20, 60), 'account': (5, 300)},
+    'signup': {'ip': (5, 3600)},
+    'apply': {'ip': (30, 60), 'account': (10, 60)},
+}
+RATE_LIMIT_CACHE = 'default'
+RATE_LIMIT_IP_HEADER = None
+RATE_LIMIT_TRUSTED_PROXIES = 1
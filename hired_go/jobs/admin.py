@@ -6,3 +6,5 @@ admin.site.register(JobSearcher)
 admin.site.register(Recruiter)
 admin.site.register(Vacancy)
 admin.site.register(Application)
+admin.site.register(Skill)
+admin.site.register(SkillAlias)
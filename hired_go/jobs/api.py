@@ -0,0 +1,85 @@
+from rest_framework import permissions, viewsets
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.throttling import AnonRateThrottle, UserRateThrottle
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Application, JobSearcher, Recruiter, Vacancy
+from .pagination import KeysetPaginator, get_page_size
+from .serializers import ApplicationSerializer, RecruiterSerializer, VacancySerializer
+
+
+class KeysetCursorPagination(BasePagination):
+    """DRF adapter for KeysetPaginator; the view supplies ``cursor_keys``."""
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = KeysetPaginator(queryset, get_page_size(request), keys=view.cursor_keys)
+        self.page = paginator.page(after=request.query_params.get('after'),
+                                   before=request.query_params.get('before'))
+        return list(self.page)
+
+    def _link(self, param, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'before' if param == 'after' else 'after')
+        return replace_query_param(url, param, cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self._link('after', self.page.next_cursor),
+            'previous': self._link('before', self.page.previous_cursor),
+            'results': data,
+        })
+
+
+class ReadOnlyAPIViewSet(viewsets.ReadOnlyModelViewSet):
+    pagination_class = KeysetCursorPagination
+    throttle_classes = [AnonRateThrottle, UserRateThrottle]
+    cursor_keys = ('id',)
+
+    def requested_fields(self):
+        fields = self.request.query_params.get('fields')
+        if not fields:
+            return None
+        return [name.strip() for name in fields.split(',') if name.strip()]
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+
+class VacancyViewSet(ReadOnlyAPIViewSet):
+    serializer_class = VacancySerializer
+    permission_classes = [permissions.AllowAny]
+    cursor_keys = ('start_date', 'id')
+
+    def get_queryset(self):
+        queryset = Vacancy.objects.defer('search_vector')
+        fields = self.requested_fields()
+        if fields is None or 'company' in fields:
+            queryset = queryset.select_related('company_name')
+        return queryset
+
+
+class RecruiterViewSet(ReadOnlyAPIViewSet):
+    serializer_class = RecruiterSerializer
+    permission_classes = [permissions.AllowAny]
+    queryset = Recruiter.objects.filter(status='Accepted')
+
+
+class ApplicationViewSet(ReadOnlyAPIViewSet):
+    serializer_class = ApplicationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    cursor_keys = ('application_date', 'id')
+
+    def get_queryset(self):
+        queryset = Application.objects.select_related('vacancy', 'applicant__user')
+        user = self.request.user
+        if user.is_superuser:
+            return queryset
+        recruiter = Recruiter.objects.filter(user=user).first()
+        if recruiter is not None:
+            return queryset.filter(company=recruiter)
+        return queryset.filter(applicant__in=JobSearcher.objects.filter(user=user))
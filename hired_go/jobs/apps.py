@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class JobsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'jobs'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .thumbnails import pregenerate
+        from .uploads import POST_PROCESSORS
+
+        POST_PROCESSORS.append(pregenerate)
@@ -0,0 +1,101 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.safestring import mark_safe
+
+
+FRAGMENTS = ('index', 'job_detail', 'job_board', 'job_facets')
+
+
+def _version_key(name):
+    return 'jobs:version:%s' % name
+
+
+def get_versions(*names):
+    """
+    Return the current version token of each namespace. Cached entries embed
+    these tokens in their keys, so bumping a version orphans every entry built
+    from the old data without having to find and delete it.
+    """
+    keys = [_version_key(name) for name in names]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+async def aget_versions(*names):
+    keys = [_version_key(name) for name in names]
+    found = await cache.aget_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        await cache.aset_many(missing, None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump_version(*names):
+    for name in names:
+        try:
+            cache.incr(_version_key(name))
+        except ValueError:
+            cache.set(_version_key(name), time.time_ns(), None)
+
+
+def record(fragment, hit):
+    key = 'jobs:stats:%s:%s' % (fragment, 'hits' if hit else 'misses')
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, None)
+
+
+async def arecord(fragment, hit):
+    key = 'jobs:stats:%s:%s' % (fragment, 'hits' if hit else 'misses')
+    if not await cache.aadd(key, 1, None):
+        try:
+            await cache.aincr(key)
+        except ValueError:
+            await cache.aset(key, 1, None)
+
+
+def stats():
+    keys = {(name, kind): 'jobs:stats:%s:%s' % (name, kind) for name in FRAGMENTS for kind in ('hits', 'misses')}
+    values = cache.get_many(keys.values())
+    return {name: {kind: values.get(keys[name, kind], 0) for kind in ('hits', 'misses')} for name in FRAGMENTS}
+
+
+def _fragment_key(name, parts):
+    digest = hashlib.md5(':'.join(str(part) for part in parts).encode()).hexdigest()
+    return 'jobs:fragment:%s:%s' % (name, digest)
+
+
+def _fragment_timeout(timeout):
+    return timeout if timeout is not None else getattr(settings, 'JOB_FRAGMENT_CACHE_TIMEOUT', 600)
+
+
+def cached_fragment(name, parts, render, timeout=None):
+    """Return the HTML produced by ``render()``, cached under ``name`` and ``parts``."""
+    key = _fragment_key(name, parts)
+    html = cache.get(key)
+    record(name, html is not None)
+    if html is None:
+        html = render()
+        cache.set(key, html, _fragment_timeout(timeout))
+    return mark_safe(html)
+
+
+async def acached_fragment(name, parts, render, timeout=None):
+    """Like cached_fragment, for a coroutine function ``render``."""
+    key = _fragment_key(name, parts)
+    html = await cache.aget(key)
+    await arecord(name, html is not None)
+    if html is None:
+        html = await render()
+        await cache.aset(key, html, _fragment_timeout(timeout))
+    return mark_safe(html)
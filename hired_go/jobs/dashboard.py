@@ -0,0 +1,131 @@
+import threading
+from datetime import date, timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Min, When
+from django.db.models.functions import Greatest
+
+from .models import Application, DailyApplicationStats, Vacancy, VacancyStats, VacancyStatus
+
+
+DASHBOARD_DAYS = 30
+
+# Vacancies being deleted in this thread. Their applications are deleted with
+# them, so the counts are settled once per vacancy rather than per application.
+_deleting = threading.local()
+
+
+def _deleting_vacancies():
+    if not hasattr(_deleting, 'vacancies'):
+        _deleting.vacancies = set()
+    return _deleting.vacancies
+
+
+def _upsert(model, lookup, defaults, changes):
+    """Apply ``changes`` (expressions) to the row matching ``lookup``, creating it from ``defaults`` if missing."""
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **defaults)
+    except IntegrityError:
+        model.objects.filter(**lookup).update(**changes)
+
+
+def application_added(application):
+    day = application.application_date
+    _upsert(VacancyStats, {'vacancy_id': application.vacancy_id},
+            {'company_id': application.company_id, 'applications': 1, 'first_application_date': day},
+            {'applications': F('applications') + 1,
+             'first_application_date': Case(When(first_application_date__lte=day, then=F('first_application_date')),
+                                            default=day)})
+    _upsert(DailyApplicationStats, {'company_id': application.company_id, 'day': day},
+            {'applications': 1}, {'applications': F('applications') + 1})
+
+
+def application_removed(application):
+    if application.vacancy_id in _deleting_vacancies():
+        return
+    # The earliest application may be the one removed, so recount the vacancy.
+    totals = Application.objects.filter(vacancy_id=application.vacancy_id).aggregate(
+        applications=Count('id'), first_application_date=Min('application_date'))
+    VacancyStats.objects.filter(vacancy_id=application.vacancy_id).update(**totals)
+    DailyApplicationStats.objects.filter(company_id=application.company_id, day=application.application_date,
+                                         applications__gt=0).update(applications=F('applications') - 1)
+
+
+def vacancy_removing(vacancy):
+    """
+    Take the applications of ``vacancy`` out of the daily counts before a
+    delete cascades to them, one UPDATE per (company, day); its VacancyStats
+    row goes with the vacancy.
+    """
+    _deleting_vacancies().add(vacancy.pk)
+    for row in (Application.objects.filter(vacancy=vacancy).values('company_id', 'application_date')
+                .annotate(total=Count('id')).order_by()):
+        DailyApplicationStats.objects.filter(company_id=row['company_id'], day=row['application_date']).update(
+            applications=Greatest(F('applications') - row['total'], 0))
+
+
+def vacancy_removed(vacancy):
+    _deleting_vacancies().discard(vacancy.pk)
+
+
+def rebuild(companies=None):
+    """Recompute the summary tables from Application, for ``companies`` or everyone."""
+    applications = Application.objects.all()
+    if companies is not None:
+        applications = applications.filter(company__in=companies)
+    with transaction.atomic():
+        vacancy_stats = VacancyStats.objects.all()
+        daily_stats = DailyApplicationStats.objects.all()
+        if companies is not None:
+            vacancy_stats = vacancy_stats.filter(company__in=companies)
+            daily_stats = daily_stats.filter(company__in=companies)
+        vacancy_stats.delete()
+        daily_stats.delete()
+        VacancyStats.objects.bulk_create([
+            VacancyStats(vacancy_id=row['vacancy_id'], company_id=row['company_id'], applications=row['total'],
+                         first_application_date=row['first'])
+            for row in applications.values('vacancy_id', 'company_id').annotate(
+                total=Count('id'), first=Min('application_date')).order_by().iterator()
+        ], batch_size=1000)
+        DailyApplicationStats.objects.bulk_create([
+            DailyApplicationStats(company_id=row['company_id'], day=row['application_date'], applications=row['total'])
+            for row in applications.values('company_id', 'application_date').annotate(
+                total=Count('id')).order_by().iterator()
+        ], batch_size=1000)
+
+
+def company_dashboard(company, today=None):
+    """
+    Dashboard numbers for ``company``, read from the summary tables: one row
+    per vacancy of the company plus DASHBOARD_DAYS daily rows.
+    """
+    today = today or date.today()
+    vacancies = list(Vacancy.objects.filter(company_name=company).select_related('stats')
+                     .only('id', 'title', 'creation_date', 'status', 'stats__applications',
+                           'stats__first_application_date')
+                     .order_by('-creation_date', '-id'))
+    rows, waits = [], []
+    for vacancy in vacancies:
+        stats = getattr(vacancy, 'stats', None)
+        first = stats.first_application_date if stats else None
+        wait = (first - vacancy.creation_date).days if first else None
+        if wait is not None:
+            waits.append(max(wait, 0))
+        rows.append({'vacancy': vacancy, 'applications': stats.applications if stats else 0,
+                     'status': vacancy.status, 'days_to_first_application': wait})
+
+    start = today - timedelta(days=DASHBOARD_DAYS - 1)
+    daily = dict(DailyApplicationStats.objects.filter(company=company, day__gte=start, day__lte=today)
+                 .values_list('day', 'applications'))
+    return {
+        'vacancies': rows,
+        'open_vacancies': sum(1 for row in rows if row['status'] == VacancyStatus.open.value),
+        'closed_vacancies': sum(1 for row in rows if row['status'] == VacancyStatus.closed.value),
+        'applications': sum(row['applications'] for row in rows),
+        'average_days_to_first_application': round(sum(waits) / len(waits), 1) if waits else None,
+        'daily': [{'day': start + timedelta(days=i), 'applications': daily.get(start + timedelta(days=i), 0)}
+                  for i in range(DASHBOARD_DAYS)],
+    }
@@ -0,0 +1,117 @@
+import os
+import time
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+from . import recommendations
+from .cache import bump_version
+from .dashboard import rebuild as rebuild_dashboard
+from .models import Application, JobSearcher, Recruiter, Vacancy
+from .profiles import forget
+from .search import get_backend
+from .storage import HASHED_NAME
+from .thumbnails import FORMATS as THUMBNAIL_FORMATS, derived_storage, sizes as thumbnail_sizes, thumbnail_name
+
+
+MEDIA_FIELDS = (
+    (JobSearcher, 'image'),
+    (Recruiter, 'image'),
+    (Vacancy, 'company_logo'),
+    (Application, 'resume'),
+)
+
+
+def soft_delete_company(company):
+    """
+    Hide ``company``, its vacancies and the applications to them at once and
+    disable the login. Rows are only flagged here, with one UPDATE per
+    table; purge_deleted removes them later in small batches.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        vacancy_ids = list(Vacancy.objects.filter(company_name=company).values_list('id', flat=True))
+        Recruiter.objects.filter(pk=company.pk).update(deleted_at=now)
+        Vacancy.objects.filter(company_name=company).update(deleted_at=now, updated_at=now)
+        Application.objects.filter(company=company).update(deleted_at=now)
+        User.objects.filter(pk=company.user_id).update(is_active=False)
+    forget(company.user_id)
+    get_backend().remove(vacancy_ids)
+    recommendations.matrix.remove(vacancy_ids)
+    bump_version('vacancies', 'closed_vacancies', 'recruiters')
+
+
+def soft_delete_applicant(applicant):
+    now = timezone.now()
+    with transaction.atomic():
+        JobSearcher.objects.filter(pk=applicant.pk).update(deleted_at=now)
+        Application.objects.filter(applicant=applicant).update(deleted_at=now)
+        User.objects.filter(pk=applicant.user_id).update(is_active=False)
+    forget(applicant.user_id)
+    bump_version('applicant:%s' % applicant.pk)
+
+
+def _delete_in_batches(queryset, batch_size):
+    total = 0
+    while True:
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            queryset.model._base_manager.filter(id__in=ids).delete()
+        total += len(ids)
+
+
+def purge_deleted(before, batch_size=500):
+    """
+    Hard-delete rows soft-deleted before ``before``, children first and
+    ``batch_size`` rows per transaction, so no statement holds locks on more
+    than one batch. Returns the number of rows removed per model.
+    """
+    applications = Application.all_objects.filter(deleted_at__lt=before)
+    companies = set(applications.values_list('company_id', flat=True).distinct())
+    counts = {'applications': _delete_in_batches(applications, batch_size)}
+    live = Recruiter.objects.filter(id__in=companies)
+    if live.exists():
+        rebuild_dashboard(list(live))
+
+    counts['vacancies'] = _delete_in_batches(Vacancy.all_objects.filter(deleted_at__lt=before), batch_size)
+    for key, model in (('applicants', JobSearcher), ('companies', Recruiter)):
+        users = User.objects.filter(id__in=model.all_objects.filter(deleted_at__lt=before).values('user_id'))
+        counts[key] = _delete_in_batches(users, batch_size)
+    return counts
+
+
+def _referenced_names(batch_size):
+    names = set()
+    for model, field_name in MEDIA_FIELDS:
+        names.update(model.all_objects.exclude(**{field_name: ''}).exclude(**{field_name + '__isnull': True})
+                     .values_list(field_name, flat=True).distinct().iterator(chunk_size=batch_size))
+    return names
+
+
+def purge_orphaned_media(min_age=24 * 60 * 60, batch_size=2000):
+    """
+    Remove content-addressed media files (and their thumbnails) that no row
+    references any more. Files younger than ``min_age`` seconds are kept, as
+    an upload may be stored before its row is updated. Returns the names removed.
+    """
+    referenced = _referenced_names(batch_size)
+    cutoff = time.time() - min_age
+    removed = []
+    root = settings.MEDIA_ROOT
+    for directory, _, files in os.walk(root):
+        for filename in files:
+            path = os.path.join(directory, filename)
+            name = os.path.relpath(path, root).replace(os.sep, '/')
+            if not HASHED_NAME.match(name) or name in referenced or os.path.getmtime(path) > cutoff:
+                continue
+            default_storage.delete(name)
+            for size in thumbnail_sizes():
+                for image_format in THUMBNAIL_FORMATS:
+                    derived_storage.delete(thumbnail_name(name, size, image_format))
+            removed.append(name)
+    return removed
@@ -0,0 +1,104 @@
+import csv
+import json
+import tempfile
+
+from django.conf import settings
+from django.http import FileResponse, StreamingHttpResponse
+
+
+APPLICATION_COLUMNS = (
+    ('id', 'id'),
+    ('vacancy_id', 'vacancy_id'),
+    ('vacancy_title', 'vacancy__title'),
+    ('applicant_id', 'applicant_id'),
+    ('first_name', 'applicant__user__first_name'),
+    ('last_name', 'applicant__user__last_name'),
+    ('email', 'applicant__user__username'),
+    ('phone', 'applicant__phone'),
+    ('application_date', 'application_date'),
+    ('resume', 'resume'),
+)
+
+APPLICANT_COLUMNS = (
+    ('id', 'id'),
+    ('first_name', 'user__first_name'),
+    ('last_name', 'user__last_name'),
+    ('email', 'user__username'),
+    ('phone', 'phone'),
+    ('gender', 'gender'),
+    ('date_joined', 'user__date_joined'),
+)
+
+FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def _rows(queryset, columns, chunk_size):
+    lookups = [lookup for _, lookup in columns]
+    media_columns = [i for i, (name, _) in enumerate(columns) if name == 'resume']
+    for row in queryset.order_by('id').values_list(*lookups).iterator(chunk_size=chunk_size):
+        if media_columns:
+            row = list(row)
+            for i in media_columns:
+                row[i] = settings.MEDIA_URL + row[i] if row[i] else ''
+        yield row
+
+
+def _csv(header, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _ndjson(header, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), default=str) + '\n'
+
+
+def _buffered(lines, size):
+    buffer = []
+    for line in lines:
+        buffer.append(line)
+        if len(buffer) >= size:
+            yield ''.join(buffer)
+            buffer = []
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _spooled(chunks):
+    spool = tempfile.SpooledTemporaryFile(max_size=getattr(settings, 'EXPORT_SPOOL_MEMORY', 1024 * 1024))
+    for chunk in chunks:
+        spool.write(chunk.encode())
+    spool.seek(0)
+    return spool
+
+
+def export_response(queryset, columns, filename, export_format='csv', spool=False):
+    """
+    Stream ``queryset`` as CSV or NDJSON. Rows are read with a server-side
+    cursor in chunks and written as they arrive, so memory use stays flat and
+    the first bytes go out before the whole table has been read.
+
+    With ``spool`` the export is written to a temporary file first and the
+    file is streamed. Use it under ASGI, where Django 4.1 iterates streaming
+    responses on the event loop and so cannot run the queries there.
+    """
+    chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+    header = [name for name, _ in columns]
+    rows = _rows(queryset, columns, chunk_size)
+    lines = _ndjson(header, rows) if export_format == 'ndjson' else _csv(header, rows)
+    if spool:
+        response = FileResponse(_spooled(_buffered(lines, 500)), content_type=FORMATS[export_format])
+    else:
+        response = StreamingHttpResponse(_buffered(lines, 500), content_type=FORMATS[export_format])
+    response['Content-Disposition'] = 'attachment; filename="%s.%s"' % (filename, export_format)
+    return response
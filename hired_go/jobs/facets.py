@@ -0,0 +1,228 @@
+import hashlib
+from collections import defaultdict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Case, CharField, Count, F, Q, Value, When
+
+from .cache import aget_versions, arecord, get_versions, record
+from .models import Vacancy, VacancySkill, VacancyStatus
+from .skills import skill_q
+
+
+SALARY_RANGES = (
+    ('0-1000', 0, 1000),
+    ('1000-3000', 1000, 3000),
+    ('3000-5000', 3000, 5000),
+    ('5000+', 5000, None),
+)
+
+AVAILABILITY_LABELS = {'open': 'Open', 'upcoming': 'Not open yet', 'closed': 'Closed'}
+
+FACETS = (
+    ('tech_stack', 'Tech Stack'),
+    ('vacancy_type', 'Vacancy Type'),
+    ('location', 'Location'),
+    ('salary_range', 'Salary'),
+    ('availability', 'Availability'),
+)
+FACET_NAMES = tuple(name for name, _ in FACETS)
+# Skills are many-to-many, so they filter the grouped rows instead of being a column of them.
+FILTER_NAMES = FACET_NAMES + ('skill',)
+SKILL_FACET_SIZE = 20
+
+
+def _salary_q(key):
+    for name, low, high in SALARY_RANGES:
+        if name == key:
+            q = Q(salary__gte=low)
+            if high is not None:
+                q &= Q(salary__lt=high)
+            return q
+    return None
+
+
+# Without an explicit choice the board lists open vacancies only, which the
+# partial index vacancy_live_open_idx covers.
+DEFAULT_FILTERS = {'availability': [VacancyStatus.open.value]}
+
+
+def _availability_q(key):
+    if key in AVAILABILITY_LABELS:
+        return Q(status=key)
+    return None
+
+
+def selected_filters(params):
+    selected = {}
+    for name in FILTER_NAMES:
+        values = sorted({value for value in params.getlist(name) if value})
+        if values:
+            selected[name] = values
+        elif name in DEFAULT_FILTERS:
+            selected[name] = DEFAULT_FILTERS[name]
+    return selected
+
+
+def filter_query(selected):
+    return urlencode([(name, value) for name in FILTER_NAMES for value in selected.get(name, ())])
+
+
+def facet_q(name, values):
+    if name == 'salary_range':
+        terms = [_salary_q(value) for value in values]
+    elif name == 'availability':
+        terms = [_availability_q(value) for value in values]
+    elif name == 'skill':
+        return skill_q(values)
+    else:
+        return Q(**{'%s__in' % name: values})
+    q = Q(pk__in=[])
+    for term in terms:
+        if term is not None:
+            q |= term
+    return q
+
+
+def filter_vacancies(queryset, selected):
+    for name, values in selected.items():
+        queryset = queryset.filter(facet_q(name, values))
+    return queryset
+
+
+def _annotate(queryset):
+    salary = Case(
+        *[When(_salary_q(name), then=Value(name)) for name, _, _ in SALARY_RANGES],
+        default=Value(''), output_field=CharField(),
+    )
+    return queryset.annotate(salary_range=salary, availability=F('status'))
+
+
+def _grouped_query(skills, closed):
+    if closed:
+        vacancies = Vacancy.objects.filter(status=VacancyStatus.closed.value)
+    else:
+        vacancies = Vacancy.objects.exclude(status=VacancyStatus.closed.value)
+    if skills:
+        vacancies = vacancies.filter(skill_q(skills))
+    return _annotate(vacancies).values_list(*FACET_NAMES).annotate(total=Count('id')).order_by()
+
+
+def _skill_query(skills):
+    # Open vacancies per skill, regardless of the other facets: the most
+    # common SKILL_FACET_SIZE skills plus any already selected.
+    counts = (VacancySkill.objects.filter(vacancy__status=VacancyStatus.open.value, vacancy__deleted_at=None)
+              .values_list('skill__slug', 'skill__name').annotate(total=Count('id')))
+    top = counts.order_by('-total', 'skill__slug')[:SKILL_FACET_SIZE]
+    return (top, counts.filter(skill__slug__in=skills).order_by()) if skills else (top,)
+
+
+def _rows_key(kind, version, skills):
+    return 'jobs:facets:%s:%s:%s' % (kind, version, hashlib.md5('|'.join(skills).encode()).hexdigest())
+
+
+def _history_timeout():
+    return getattr(settings, 'JOB_FACET_HISTORY_TIMEOUT', 3600)
+
+
+def _grouped_rows(skills=()):
+    """
+    Count vacancies per combination of facet values in a single GROUP BY.
+    The result depends only on the selected skills, not on the other
+    facets, so one cached copy serves every filter combination until a
+    vacancy changes. Closed vacancies, the bulk of the table, are counted
+    separately and only recounted when the closed set changes.
+    """
+    live_version, closed_version = get_versions('vacancies', 'closed_vacancies')
+    key = _rows_key('live', live_version, skills)
+    rows = cache.get(key)
+    record('job_facets', rows is not None)
+    if rows is None:
+        rows = ([tuple(row) for row in _grouped_query(skills, closed=False)],
+                [tuple(row) for query in _skill_query(skills) for row in query])
+        cache.set(key, rows, getattr(settings, 'JOB_FACET_CACHE_TIMEOUT', 300))
+    key = _rows_key('closed', closed_version, skills)
+    closed = cache.get(key)
+    if closed is None:
+        closed = [tuple(row) for row in _grouped_query(skills, closed=True)]
+        cache.set(key, closed, _history_timeout())
+    return rows[0] + closed, rows[1]
+
+
+async def _agrouped_rows(skills=()):
+    live_version, closed_version = await aget_versions('vacancies', 'closed_vacancies')
+    key = _rows_key('live', live_version, skills)
+    rows = await cache.aget(key)
+    await arecord('job_facets', rows is not None)
+    if rows is None:
+        rows = ([tuple(row) async for row in _grouped_query(skills, closed=False)],
+                [tuple(row) for query in _skill_query(skills) async for row in query])
+        await cache.aset(key, rows, getattr(settings, 'JOB_FACET_CACHE_TIMEOUT', 300))
+    key = _rows_key('closed', closed_version, skills)
+    closed = await cache.aget(key)
+    if closed is None:
+        closed = [tuple(row) async for row in _grouped_query(skills, closed=True)]
+        await cache.aset(key, closed, _history_timeout())
+    return rows[0] + closed, rows[1]
+
+
+def _count(rows, selected):
+    # A facet's counts honour the other facets' selections but not its own,
+    # so each option shows how many results choosing it would give.
+    counts = {name: defaultdict(int) for name in FACET_NAMES}
+    positions = {name: i for i, name in enumerate(FACET_NAMES)}
+    for row in rows:
+        total = row[-1]
+        for name in FACET_NAMES:
+            if all(row[positions[other]] in values for other, values in selected.items()
+                   if other != name and other in positions):
+                counts[name][row[positions[name]]] += total
+    return counts
+
+
+def _labels(name):
+    if name == 'tech_stack':
+        return dict(Vacancy.TECH_STACK_CHOICES)
+    if name == 'vacancy_type':
+        return dict(Vacancy.VACANCY_TYPE_CHOICES)
+    if name == 'availability':
+        return AVAILABILITY_LABELS
+    if name == 'salary_range':
+        return {key: key for key, _, _ in SALARY_RANGES}
+    return {}
+
+
+def _skill_facet(rows, selected):
+    chosen = selected.get('skill', ())
+    options = {slug: {'value': slug, 'label': name, 'count': total, 'selected': slug in chosen}
+               for slug, name, total in rows}
+    options = sorted(options.values(), key=lambda option: (-option['count'], option['label']))
+    return {'name': 'skill', 'label': 'Skills', 'options': options}
+
+
+def _facets(counts, selected, skill_rows):
+    facets = []
+    for name, label in FACETS:
+        labels = _labels(name)
+        chosen = selected.get(name, ())
+        values = set(counts[name]) | set(chosen)
+        options = [
+            {'value': value, 'label': labels.get(value, value), 'count': counts[name].get(value, 0),
+             'selected': value in chosen}
+            for value in values if value
+        ]
+        options.sort(key=lambda option: (-option['count'], option['label']))
+        facets.append({'name': name, 'label': label, 'options': options})
+    facets.append(_skill_facet(skill_rows, selected))
+    return facets
+
+
+def facet_counts(selected):
+    rows, skill_rows = _grouped_rows(tuple(selected.get('skill', ())))
+    return _facets(_count(rows, selected), selected, skill_rows)
+
+
+async def afacet_counts(selected):
+    rows, skill_rows = await _agrouped_rows(tuple(selected.get('skill', ())))
+    return _facets(_count(rows, selected), selected, skill_rows)
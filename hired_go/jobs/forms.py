@@ -22,3 +22,11 @@ class VacancyForm(forms.ModelForm):
         widgets = {
             'company_logo': forms.ClearableFileInput(attrs={'multiple': False}),
         }
+
+
+class VacancyImportForm(VacancyForm):
+    """VacancyForm rules for one imported row; company and logo come from the importing recruiter."""
+
+    class Meta(VacancyForm.Meta):
+        fields = ['title', 'vacancy_type', 'salary', 'description', 'experience', 'location', 'skills',
+                  'tech_stack', 'start_date', 'end_date']
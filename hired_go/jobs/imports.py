@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .cache import bump_version
+from .forms import VacancyImportForm
+from .models import Vacancy
+from .search import get_backend
+from .skills import sync_skills
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.errors = []
+        self.pks = []
+
+    @property
+    def ok(self):
+        return not self.errors
+
+
+class VacancyRowValidator:
+    """
+    Applies VacancyImportForm's field rules to plain dicts. The form's fields
+    are built once and reused, instead of constructing (and deep-copying) a
+    whole bound form for every row.
+    """
+
+    def __init__(self):
+        self.fields = VacancyImportForm().fields
+
+    def clean(self, row):
+        cleaned, errors = {}, {}
+        for name, field in self.fields.items():
+            try:
+                cleaned[name] = field.clean(field.widget.value_from_datadict(row, {}, name))
+            except ValidationError as exc:
+                errors[name] = exc.messages
+        return cleaned, errors
+
+
+def read_rows(fileobj, name):
+    """Yield one dict per row from a CSV or JSON (array of objects) upload."""
+    if name.lower().endswith('.json'):
+        data = json.load(fileobj)
+        if not isinstance(data, list):
+            raise ValueError("JSON imports must be an array of objects.")
+        yield from data
+        return
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(getattr(fileobj, 'file', fileobj), encoding='utf-8-sig', newline='')
+    yield from csv.DictReader(fileobj)
+
+
+def _insert(batch, result):
+    created = Vacancy.objects.bulk_create(batch)
+    sync_skills(vacancy for vacancy in created if vacancy.pk is not None)
+    result.created += len(created)
+    result.pks.extend(vacancy.pk for vacancy in created if vacancy.pk is not None)
+
+
+def import_vacancies(company, rows, batch_size=1000, strict=False):
+    """
+    Validate ``rows`` with the VacancyForm rules and insert the valid ones for
+    ``company`` with bulk_create, ``batch_size`` rows per INSERT, inside one
+    transaction. Invalid rows are reported by their 1-based row number. With
+    ``strict``, any invalid row rolls the whole import back.
+    """
+    result = ImportResult()
+    validator = VacancyRowValidator()
+    with transaction.atomic():
+        batch = []
+        for number, row in enumerate(rows, start=1):
+            if not isinstance(row, dict):
+                result.errors.append((number, {'__all__': ["Expected an object with vacancy fields."]}))
+                continue
+            cleaned, errors = validator.clean(row)
+            if errors:
+                result.errors.append((number, errors))
+                continue
+            vacancy = Vacancy(company_name=company, company_logo=company.image, **cleaned)
+            vacancy.status = vacancy.current_status()
+            batch.append(vacancy)
+            if len(batch) >= batch_size:
+                _insert(batch, result)
+                batch = []
+        if batch:
+            _insert(batch, result)
+        if strict and result.errors:
+            transaction.set_rollback(True)
+            result.created = 0
+            result.pks = []
+    for start in range(0, len(result.pks), batch_size):
+        get_backend().index(result.pks[start:start + batch_size])
+    if result.created:
+        bump_version('vacancies', 'closed_vacancies')
+    return result
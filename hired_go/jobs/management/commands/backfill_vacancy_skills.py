@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.cache import bump_version
+from jobs.models import Vacancy
+from jobs.skills import sync_skills
+
+
+class Command(BaseCommand):
+    help = ("Link every vacancy to canonical Skill rows parsed from its free-text skills. Walks the table by id "
+            "in batches, each in its own short transaction, so it can run against a live database and be resumed "
+            "with --start-id.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--start-id', type=int, default=0)
+
+    def handle(self, *args, **options):
+        vacancies = Vacancy.all_objects.only('id', 'skills').order_by('id')
+        last, total = options['start_id'], 0
+        while True:
+            batch = list(vacancies.filter(id__gt=last)[:options['batch_size']])
+            if not batch:
+                break
+            with transaction.atomic():
+                sync_skills(batch)
+            total += len(batch)
+            last = batch[-1].id
+            self.stdout.write("Linked skills up to vacancy %d (%d done)." % (last, total))
+        if total:
+            bump_version('vacancies', 'closed_vacancies')
+        self.stdout.write(self.style.SUCCESS("Linked skills for %d vacancies." % total))
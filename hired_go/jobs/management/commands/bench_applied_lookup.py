@@ -0,0 +1,70 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.test.utils import CaptureQueriesContext
+
+from jobs.models import Application, JobSearcher, Recruiter, Vacancy
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Compare the per-application \"already applied\" loop with the Exists() annotation used by the job board. "
+            "Seeds data inside a transaction that is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=5000)
+        parser.add_argument('--page-size', type=int, default=25)
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['applications'], options['page_size'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, applications, page_size, repeat):
+        user = User.objects.create_user(username='bench-company', password=None)
+        company = Recruiter.objects.create(user=user, phone='0', image='', gender='', type='company',
+                                           status='Accepted', company_name='Bench')
+        user = User.objects.create_user(username='bench-applicant', password=None)
+        applicant = JobSearcher.objects.create(user=user, phone='0', gender='', type='applicant')
+        today = date.today()
+        vacancies = Vacancy.objects.bulk_create([
+            Vacancy(title='Bench %d' % i, company_name=company, salary=0, company_logo='', description='',
+                    experience='', location='', skills='', start_date=today - timedelta(days=i % 365),
+                    end_date=today + timedelta(days=30))
+            for i in range(applications)
+        ], batch_size=1000)
+        Application.objects.bulk_create([
+            Application(vacancy=vacancy, company=company, applicant=applicant, resume='', application_date=today)
+            for vacancy in vacancies
+        ], batch_size=1000)
+
+        def legacy():
+            page = list(Vacancy.objects.order_by('-start_date', '-id')[:page_size])
+            data = [application.vacancy.id for application in Application.objects.filter(applicant=applicant)]
+            return [vacancy.id in data for vacancy in page]
+
+        def annotated():
+            page = Vacancy.objects.annotate(
+                applied=Exists(Application.objects.filter(applicant=applicant, vacancy=OuterRef('pk'))))
+            return [vacancy.applied for vacancy in page.order_by('-start_date', '-id')[:page_size]]
+
+        for name, func in (('legacy loop', legacy), ('Exists() annotation', annotated)):
+            connection.queries_log.clear()
+            with CaptureQueriesContext(connection) as context:
+                func()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            elapsed = (time.perf_counter() - started) / repeat * 1000
+            self.stdout.write('%-20s %8.1f ms/page  %6d queries' % (name, elapsed, len(context.captured_queries)))
@@ -0,0 +1,108 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from jobs.models import Vacancy
+
+
+class Command(BaseCommand):
+    help = ("Load-test read-heavy pages through the WSGI and ASGI handlers in one process, with every SQL query "
+            "delayed by --db-latency ms to simulate a slow database. Uses the data already in the database.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', action='append', dest='paths',
+                            help="Path to request (repeatable); defaults to the newest vacancy's detail page.")
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help="Requests in flight at once on the ASGI event loop.")
+        parser.add_argument('--threads', type=int, default=1,
+                            help="Threads of the WSGI worker (1 = a plain sync worker).")
+        parser.add_argument('--db-latency', type=float, default=20.0)
+
+    def handle(self, *args, **options):
+        paths = options['paths']
+        if not paths:
+            vacancy = Vacancy.objects.order_by('-id').only('id').first()
+            if vacancy is None:
+                raise CommandError("Create at least one vacancy or pass --path.")
+            paths = ['/job_detail/%d/' % vacancy.pk]
+        self.install_latency(options['db_latency'] / 1000)
+
+        total = options['requests']
+        requests = [paths[i % len(paths)] for i in range(total)]
+        runs = (
+            ('WSGI, %d thread(s)' % options['threads'], lambda: self.run_wsgi(requests, options['threads'])),
+            ('ASGI, %d in flight' % options['concurrency'],
+             lambda: asyncio.run(self.run_asgi(requests, options['concurrency']))),
+        )
+        for name, run in runs:
+            started = time.perf_counter()
+            statuses = run()
+            elapsed = time.perf_counter() - started
+            errors = sum(1 for status in statuses if status >= 400)
+            self.stdout.write('%-22s %8.1f req/s  %7.1f ms/req  %d errors'
+                              % (name, total / elapsed, elapsed / total * 1000, errors))
+
+    def install_latency(self, seconds):
+        def slow(execute, sql, params, many, context):
+            time.sleep(seconds)
+            return execute(sql, params, many, context)
+
+        def add_wrapper(sender, connection, **kwargs):
+            # Fired on every reconnect of the same per-thread wrapper object.
+            if slow not in connection.execute_wrappers:
+                connection.execute_wrappers.append(slow)
+
+        for connection in connections.all():
+            connection.close()
+        connection_created.connect(add_wrapper, weak=False)
+
+    def run_wsgi(self, requests, threads):
+        application = get_wsgi_application()
+
+        def call(path):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': '', 'SERVER_NAME': 'localhost',
+                'SERVER_PORT': '80', 'HTTP_HOST': 'localhost', 'wsgi.url_scheme': 'http',
+                'wsgi.input': BytesIO(), 'wsgi.errors': BytesIO(),
+            }
+            status = []
+            body = application(environ, lambda code, headers, exc_info=None: status.append(int(code.split()[0])))
+            b''.join(body)
+            body.close()
+            return status[0]
+
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return list(executor.map(call, requests))
+
+    async def run_asgi(self, requests, concurrency):
+        application = get_asgi_application()
+        limit = asyncio.Semaphore(concurrency)
+
+        async def call(path):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'query_string': b'',
+                'headers': [(b'host', b'localhost')], 'server': ('localhost', 80), 'client': ('127.0.0.1', 0),
+            }
+            status = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            async with limit:
+                await application(scope, receive, send)
+            return status[0]
+
+        return await asyncio.gather(*(call(path) for path in requests))
@@ -0,0 +1,93 @@
+import random
+import statistics
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs import recommendations
+from jobs.cache import bump_version
+from jobs.models import Application, JobSearcher, Recruiter, TechStack, Vacancy
+
+
+SKILLS = ['skill%d' % i for i in range(300)] + ['Python', 'Django', 'React', 'SQL', 'Docker', 'Kubernetes', 'AWS']
+TITLES = ['Backend Developer', 'Frontend Developer', 'Data Engineer', 'DevOps Engineer', 'QA Engineer',
+          'Mobile Developer', 'Team Lead', 'Analyst']
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Time job recommendations for one applicant over a seeded set of open vacancies, with and without "
+            "NumPy. Seeds data inside a transaction that is rolled back afterwards.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--vacancies', type=int, default=100000)
+        parser.add_argument('--applications', type=int, default=30)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options['vacancies'], options['applications'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, vacancies, applications):
+        rng = random.Random(0)
+        today = date.today()
+        user = User.objects.create_user(username='bench-company', password=None)
+        company = Recruiter.objects.create(user=user, phone='0', image='', gender='', type='company',
+                                           status='Accepted', company_name='Bench')
+        user = User.objects.create_user(username='bench-applicant', password=None)
+        applicant = JobSearcher.objects.create(user=user, phone='0', gender='', type='applicant')
+        stacks = [stack.value for stack in TechStack]
+        jobs = Vacancy.objects.bulk_create([
+            Vacancy(title=rng.choice(TITLES), company_name=company, salary=0, company_logo='', description='',
+                    experience='', location='', skills=', '.join(rng.sample(SKILLS, rng.randint(3, 6))),
+                    tech_stack=rng.choice(stacks), start_date=today - timedelta(days=1),
+                    end_date=today + timedelta(days=30))
+            for _ in range(vacancies)
+        ], batch_size=2000)
+        Application.objects.bulk_create([
+            Application(vacancy=vacancy, company=company, applicant=applicant, resume='', application_date=today)
+            for vacancy in rng.sample(jobs, applications)
+        ])
+        return applicant
+
+    def time_calls(self, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        return statistics.median(timings), timings[int(len(timings) * 0.95) - 1]
+
+    def run(self, vacancies, applications, repeat):
+        applicant = self.seed(vacancies, applications)
+        numpy = recommendations.numpy
+        for name, module in (('numpy', numpy), ('pure python', None)):
+            if name == 'numpy' and numpy is None:
+                self.stdout.write("numpy        not installed, skipped")
+                continue
+            recommendations.numpy = module
+            started = time.perf_counter()
+            recommendations.matrix.rebuild()
+            built = (time.perf_counter() - started) * 1000
+
+            def miss():
+                bump_version('applicant:%s' % applicant.pk)
+                return recommendations.recommend(applicant)
+
+            miss_p50, miss_p95 = self.time_calls(miss, repeat)
+            hit_p50, hit_p95 = self.time_calls(lambda: recommendations.recommend(applicant), repeat)
+            self.stdout.write('%-12s build %7.0f ms  uncached p50 %6.1f ms  p95 %6.1f ms  cached p50 %5.1f ms  '
+                              'p95 %5.1f ms' % (name, built, miss_p50, miss_p95, hit_p50, hit_p95))
+        recommendations.numpy = numpy
+        recommendations.matrix.reset()
@@ -0,0 +1,45 @@
+import os
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from jobs.models import Application, JobSearcher, Recruiter, Vacancy
+from jobs.storage import HASHED_NAME
+
+
+MEDIA_FIELDS = (
+    (JobSearcher, 'image'),
+    (Recruiter, 'image'),
+    (Vacancy, 'company_logo'),
+    (Application, 'resume'),
+)
+
+
+class Command(BaseCommand):
+    help = "Move media stored under legacy flat names into the content-addressed layout."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--delete-originals', action='store_true',
+                            help="Remove each legacy file once every row referencing it has been updated.")
+
+    def handle(self, *args, **options):
+        moved = {}
+        for model, field_name in MEDIA_FIELDS:
+            names = list(model.all_objects.exclude(**{field_name: ''}).exclude(**{field_name + '__isnull': True})
+                         .values_list(field_name, flat=True).distinct())
+            for name in names:
+                if HASHED_NAME.match(name):
+                    continue
+                if name not in moved:
+                    if not default_storage.exists(name):
+                        self.stderr.write("Missing file %s" % name)
+                        continue
+                    with default_storage.open(name, 'rb') as original:
+                        moved[name] = default_storage.save(name, original)
+                updated = model.all_objects.filter(**{field_name: name}).update(**{field_name: moved[name]})
+                self.stdout.write("%s.%s: %s -> %s (%d rows)" % (model.__name__, field_name, name, moved[name],
+                                                                updated))
+        if options['delete_originals']:
+            for name in moved:
+                os.remove(default_storage.path(name))
+        self.stdout.write(self.style.SUCCESS("Moved %d files into content-addressed storage." % len(moved)))
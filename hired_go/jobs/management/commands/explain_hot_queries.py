@@ -0,0 +1,122 @@
+import re
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.http import QueryDict
+
+from jobs.facets import filter_vacancies, selected_filters
+from jobs.models import Application, JobSearcher, Recruiter, Vacancy
+from jobs.skills import sync_skills
+
+
+# Most companies are accepted; one in 50 is pending and one in 50 rejected.
+# Only the rare statuses are checked: listing the accepted majority is
+# rightly a sequential scan on PostgreSQL.
+RARE_STATUSES = ('pending', 'Rejected')
+
+
+def company_status(i):
+    return RARE_STATUSES[i % 50] if i % 50 < len(RARE_STATUSES) else 'Accepted'
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ("Seed a dataset inside a rolled-back transaction and check with EXPLAIN that the job board, "
+            "company status lists and applicant lists read their main table through an index.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--companies', type=int, default=3000)
+        parser.add_argument('--vacancies', type=int, default=20000)
+        parser.add_argument('--applications', type=int, default=20000)
+        parser.add_argument('--verbose-plans', action='store_true')
+
+    def handle(self, *args, **options):
+        self.failures = []
+        try:
+            with transaction.atomic():
+                self.seed(options['companies'], options['vacancies'], options['applications'])
+                self.check_plans(options['verbose_plans'])
+                raise Rollback
+        except Rollback:
+            pass
+        if self.failures:
+            raise CommandError("Full table scan in: %s" % ", ".join(self.failures))
+
+    def seed(self, companies, vacancies, applications):
+        users = User.objects.bulk_create([
+            User(username='explain-company-%d' % i) for i in range(companies)
+        ] + [User(username='explain-applicant-%d' % i) for i in range(max(1, applications // 10))], batch_size=1000)
+        recruiters = Recruiter.objects.bulk_create([
+            Recruiter(user=user, phone='0', image='', gender='', type='company', status=company_status(i),
+                      company_name='Company %d' % i)
+            for i, user in enumerate(users[:companies])
+        ], batch_size=1000)
+        searchers = JobSearcher.objects.bulk_create([
+            JobSearcher(user=user, phone='0', gender='', type='applicant') for user in users[companies:]
+        ], batch_size=1000)
+        today = date.today()
+        jobs = Vacancy.objects.bulk_create([
+            Vacancy(title='Vacancy %d' % i, company_name=recruiters[i % companies], salary=0, company_logo='',
+                    description='', experience='', location='', skills='skill %d, skill %d' % (i % 500, i % 7),
+                    start_date=today - timedelta(days=i % 1000), end_date=today + timedelta(days=i % 60 - 50),
+                    status='open' if i % 60 >= 50 else 'closed')
+            for i in range(vacancies)
+        ], batch_size=1000)
+        sync_skills(jobs)
+        Application.objects.bulk_create([
+            Application(vacancy=jobs[i % vacancies], company=jobs[i % vacancies].company_name,
+                        applicant=searchers[i % len(searchers)], resume='', application_date=today)
+            for i in range(applications)
+        ], batch_size=1000, ignore_conflicts=True)
+        if connection.vendor in ('postgresql', 'sqlite'):
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+        self.recruiter = recruiters[0]
+        self.vacancy = jobs[0]
+        self.applicant = searchers[0]
+
+    def hot_queries(self):
+        # The board's own query: AllJobsView with no filters chosen, then with a skill.
+        applied = Exists(Application.objects.filter(applicant=self.applicant, vacancy=OuterRef('pk')))
+        for name, params in (('job board', ''), ('job board by skill', 'skill=skill+42')):
+            vacancies = filter_vacancies(Vacancy.objects.select_related('company_name'),
+                                         selected_filters(QueryDict(params)))
+            yield (name, ('jobs_vacancy', 'jobs_application', 'U0', 'jobs_vacancyskill', 'jobs_skill'),
+                   vacancies.annotate(applied=applied).order_by('-start_date', '-id')[:25])
+        for status in RARE_STATUSES:
+            yield ('%s companies' % status.lower(), ('jobs_recruiter',),
+                   Recruiter.objects.filter(status=status).select_related('user'))
+        yield ('recruiter applicants', ('jobs_application',),
+               Application.objects.filter(company=self.recruiter).select_related('vacancy', 'applicant__user')
+               .order_by('-score', '-id')[:25])
+        yield ('vacancy applicants by score', ('jobs_application',),
+               Application.objects.filter(vacancy=self.vacancy).order_by('-score', '-id')[:25])
+        yield ('applicant applications', ('jobs_application',),
+               Application.objects.filter(applicant=self.applicant))
+
+    def full_scan(self, plan, tables):
+        for table in tables:
+            if connection.vendor == 'sqlite':
+                pattern = r'\bSCAN (TABLE )?%s\b(?! USING)' % re.escape(table)
+            else:
+                pattern = r'\bSeq Scan on %s\b' % re.escape(table)
+            if re.search(pattern, plan, re.IGNORECASE):
+                return True
+        return False
+
+    def check_plans(self, verbose):
+        for name, tables, queryset in self.hot_queries():
+            plan = queryset.explain()
+            if self.full_scan(plan, tables):
+                self.failures.append(name)
+                self.stdout.write(self.style.ERROR('FAIL  %s' % name))
+            else:
+                self.stdout.write(self.style.SUCCESS('ok    %s' % name))
+            if verbose or self.full_scan(plan, tables):
+                self.stdout.write('      ' + plan.replace('\n', '\n      '))
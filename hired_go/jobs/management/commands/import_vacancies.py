@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.imports import import_vacancies, read_rows
+from jobs.models import Recruiter
+
+
+class Command(BaseCommand):
+    help = "Bulk import vacancies for a company from a CSV or JSON file."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument('--company', required=True, help="Username of the recruiter account.")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--strict', action='store_true', help="Import nothing if any row is invalid.")
+
+    def handle(self, *args, **options):
+        try:
+            company = Recruiter.objects.get(user__username=options['company'])
+        except Recruiter.DoesNotExist:
+            raise CommandError("No company with username %r." % options['company'])
+
+        started = time.perf_counter()
+        with open(options['path'], 'rb') as fileobj:
+            try:
+                result = import_vacancies(company, read_rows(fileobj, options['path']),
+                                          batch_size=options['batch_size'], strict=options['strict'])
+            except ValueError as exc:
+                raise CommandError("Could not read %s: %s" % (options['path'], exc))
+        elapsed = time.perf_counter() - started
+
+        for number, errors in result.errors:
+            messages = "; ".join("%s: %s" % (field, " ".join(field_errors)) for field, field_errors in errors.items())
+            self.stderr.write("row %d: %s" % (number, messages))
+        self.stdout.write(self.style.SUCCESS("Imported %d vacancies, rejected %d rows in %.1fs."
+                                             % (result.created, len(result.errors), elapsed)))
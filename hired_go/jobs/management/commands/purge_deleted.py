@@ -0,0 +1,27 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from jobs.deletion import purge_deleted, purge_orphaned_media
+
+
+class Command(BaseCommand):
+    help = ("Permanently remove soft-deleted companies, applicants, vacancies and applications in small batches, "
+            "then media files nothing references. Intended to run from cron.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--grace-days', type=int, default=0,
+                            help="Only purge rows deleted at least this many days ago.")
+        parser.add_argument('--skip-media', action='store_true')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['grace_days'])
+        counts = purge_deleted(before, batch_size=options['batch_size'])
+        for name, count in counts.items():
+            self.stdout.write("%-13s %d purged" % (name, count))
+        if not options['skip_media']:
+            removed = purge_orphaned_media()
+            self.stdout.write("%-13s %d removed" % ('media files', len(removed)))
+        self.stdout.write(self.style.SUCCESS("Purge complete."))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.dashboard import rebuild
+from jobs.models import Recruiter
+
+
+class Command(BaseCommand):
+    help = "Recompute the recruiter dashboard summary tables from the applications table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--company', action='append', dest='companies', metavar='USERNAME',
+                            help="Only rebuild this recruiter's rows (repeatable).")
+
+    def handle(self, *args, **options):
+        companies = None
+        if options['companies']:
+            companies = list(Recruiter.objects.filter(user__username__in=options['companies']))
+            if len(companies) != len(set(options['companies'])):
+                raise CommandError("Unknown recruiter in %s." % ', '.join(options['companies']))
+        rebuild(companies)
+        self.stdout.write(self.style.SUCCESS("Rebuilt dashboard statistics for %s."
+                                             % ('%d companies' % len(companies) if companies else 'all companies')))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from jobs.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Recompute the job search index for every vacancy."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        backend.rebuild(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS("Rebuilt search index with %s." % type(backend).__name__))
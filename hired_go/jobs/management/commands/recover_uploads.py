@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from jobs.uploads import recover_stale_uploads
+
+
+class Command(BaseCommand):
+    help = ("Finish uploads left pending when the process holding the upload workers stopped: process staged files "
+            "whose row still waits for them, delete the rest and mark pending rows without a file as failed. "
+            "Intended to run from cron and after deploys.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=60,
+                            help="Only touch staged files at least this many minutes old.")
+
+    def handle(self, *args, **options):
+        processed, removed, failed = recover_stale_uploads(options['older_than'] * 60)
+        self.stdout.write(self.style.SUCCESS("Processed %d staged uploads, removed %d orphaned files, marked %d "
+                                             "uploads as failed." % (processed, removed, failed)))
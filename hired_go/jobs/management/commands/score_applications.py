@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from jobs.ranking import score_applications
+
+
+class Command(BaseCommand):
+    help = ("Score new applications against their vacancy and rescore stale ones, so recruiters can list "
+            "applicants best match first. Safe to run from cron as often as wanted.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--rescore-after', type=int, default=None,
+                            help="Seconds after which a score is recomputed (default RANKING_RESCORE_AFTER).")
+
+    def handle(self, *args, **options):
+        total = score_applications(options['batch_size'], options['rescore_after'])
+        self.stdout.write(self.style.SUCCESS("Scored %d applications." % total))
@@ -0,0 +1,40 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from jobs.cache import bump_version
+from jobs.models import Vacancy, VacancyStatus
+
+
+def status_conditions(today):
+    return (
+        (VacancyStatus.closed.value, Q(end_date__lt=today)),
+        (VacancyStatus.upcoming.value, Q(start_date__gt=today, end_date__gte=today)),
+        (VacancyStatus.open.value, Q(start_date__lte=today, end_date__gte=today)),
+    )
+
+
+class Command(BaseCommand):
+    help = ("Move vacancies whose dates have passed to their current status (upcoming, open, closed). "
+            "Safe to run from cron as often as wanted; each batch is its own short transaction.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        today = date.today()
+        total = 0
+        for status, condition in status_conditions(today):
+            stale = Vacancy.objects.filter(condition).exclude(status=status)
+            while True:
+                with transaction.atomic():
+                    ids = list(stale.values_list('id', flat=True)[:options['batch_size']])
+                    if not ids:
+                        break
+                    total += Vacancy.objects.filter(id__in=ids).update(status=status, updated_at=timezone.now())
+        if total:
+            bump_version('vacancies', 'closed_vacancies')
+        self.stdout.write(self.style.SUCCESS("Updated the status of %d vacancies." % total))
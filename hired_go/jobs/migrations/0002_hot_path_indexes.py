@@ -0,0 +1,60 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:24
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    duplicates = (Application.objects.values('applicant', 'vacancy')
+                  .annotate(first_id=Min('id'), total=Count('id'))
+                  .filter(total__gt=1))
+    for row in duplicates.iterator():
+        (Application.objects.filter(applicant=row['applicant'], vacancy=row['vacancy'])
+         .exclude(id=row['first_id']).delete())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='jobsearcher',
+            name='image',
+            field=models.ImageField(null=True, upload_to=''),
+        ),
+        migrations.AlterField(
+            model_name='jobsearcher',
+            name='phone',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='recruiter',
+            name='phone',
+            field=models.CharField(max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['company'], name='application_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recruiter',
+            index=models.Index(fields=['status'], name='recruiter_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['-start_date', '-id'], name='vacancy_start_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(fields=['end_date'], name='vacancy_end_date_idx'),
+        ),
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('applicant', 'vacancy'), name='unique_application'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.db import migrations, transaction
+from django.db.models import Max, OuterRef, Subquery
+
+
+BATCH_SIZE = 5000
+
+
+def backfill_recruiter(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    Vacancy = apps.get_model('jobs', 'Vacancy')
+    company = Subquery(Vacancy.objects.filter(pk=OuterRef('vacancy_id')).values('company_name_id')[:1])
+    last_id = Application.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+    for start in range(0, last_id + 1, BATCH_SIZE):
+        with transaction.atomic(using=schema_editor.connection.alias):
+            (Application.objects
+             .filter(id__gte=start, id__lt=start + BATCH_SIZE, recruiter__isnull=True)
+             .update(recruiter=company))
+
+
+def restore_company(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    for application in Application.objects.select_related('recruiter__user').iterator(chunk_size=BATCH_SIZE):
+        application.company = application.recruiter.user.username
+        application.save(update_fields=['company'])
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ('jobs', '0003_application_recruiter'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_recruiter, restore_company),
+    ]
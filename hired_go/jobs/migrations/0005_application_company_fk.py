@@ -0,0 +1,26 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0004_backfill_application_recruiter'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='application',
+            name='company',
+        ),
+        migrations.RenameField(
+            model_name='application',
+            old_name='recruiter',
+            new_name='company',
+        ),
+        migrations.AlterField(
+            model_name='application',
+            name='company',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jobs.recruiter'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX vacancy_search_vector_idx ON jobs_vacancy USING gin (search_vector)'
+    )
+    schema_editor.execute(
+        "UPDATE jobs_vacancy SET search_vector ="
+        " setweight(to_tsvector('english', coalesce(title, '')), 'A') ||"
+        " setweight(to_tsvector('english', coalesce(skills, '')), 'B') ||"
+        " setweight(to_tsvector('english', coalesce(tech_stack, '')), 'B') ||"
+        " setweight(to_tsvector('english', coalesce(location, '')), 'C') ||"
+        " setweight(to_tsvector('english', coalesce(description, '')), 'D')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS vacancy_search_vector_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0005_application_company_fk'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacancy',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:50
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+import django.db.models.deletion
+
+
+def backfill_stats(apps, schema_editor):
+    Application = apps.get_model('jobs', 'Application')
+    VacancyStats = apps.get_model('jobs', 'VacancyStats')
+    DailyApplicationStats = apps.get_model('jobs', 'DailyApplicationStats')
+    VacancyStats.objects.bulk_create([
+        VacancyStats(vacancy_id=row['vacancy_id'], company_id=row['company_id'], applications=row['total'],
+                     first_application_date=row['first'])
+        for row in Application.objects.values('vacancy_id', 'company_id').annotate(
+            total=Count('id'), first=Min('application_date')).order_by().iterator()
+    ], batch_size=1000)
+    DailyApplicationStats.objects.bulk_create([
+        DailyApplicationStats(company_id=row['company_id'], day=row['application_date'], applications=row['total'])
+        for row in Application.objects.values('company_id', 'application_date').annotate(
+            total=Count('id')).order_by().iterator()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0008_upload_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VacancyStats',
+            fields=[
+                ('vacancy', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='jobs.vacancy')),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('first_application_date', models.DateField(null=True)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jobs.recruiter')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyApplicationStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('company', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jobs.recruiter')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='dailyapplicationstats',
+            constraint=models.UniqueConstraint(fields=('company', 'day'), name='unique_daily_application_stats'),
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:54
+
+from datetime import date
+
+from django.db import migrations, models
+
+
+def backfill_status(apps, schema_editor):
+    Vacancy = apps.get_model('jobs', 'Vacancy')
+    today = date.today()
+    Vacancy.objects.filter(end_date__lt=today).update(status='closed')
+    Vacancy.objects.filter(start_date__gt=today, end_date__gte=today).update(status='upcoming')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0010_moderation_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vacancy',
+            name='status',
+            field=models.CharField(choices=[('upcoming', 'Upcoming'), ('open', 'Open'), ('closed', 'Closed')], default='open', editable=False, max_length=10),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(condition=models.Q(('status', 'open')), fields=['-start_date', '-id'], name='vacancy_open_start_date_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 4.1.7 on 2026-10-18 16:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0011_vacancy_status'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='vacancy',
+            name='vacancy_open_start_date_idx',
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobsearcher',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='recruiter',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='vacancy',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True), ('status', 'open')), fields=['-start_date', '-id'], name='vacancy_live_open_idx'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0012_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='application',
+            name='scored_at',
+            field=models.DateTimeField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobsearcher',
+            name='experience',
+            field=models.PositiveSmallIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobsearcher',
+            name='skills',
+            field=models.CharField(blank=True, max_length=200),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['company', '-score', '-id'], name='application_company_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', True)), fields=['vacancy', '-score', '-id'], name='application_vacancy_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['scored_at'], name='application_scored_at_idx'),
+        ),
+    ]
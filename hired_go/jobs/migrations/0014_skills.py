@@ -0,0 +1,79 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:08
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Canonical name -> other spellings, stored normalised (lower case, single spaces).
+ALIASES = {
+    'JavaScript': ['js', 'ecmascript'],
+    'TypeScript': ['ts'],
+    'Python': ['python3', 'py'],
+    'PostgreSQL': ['postgres', 'psql'],
+    'Kubernetes': ['k8s'],
+    'Go': ['golang'],
+    'React': ['reactjs', 'react.js'],
+    'Node.js': ['node', 'nodejs'],
+    'Vue.js': ['vue', 'vuejs'],
+    'C++': ['cpp'],
+    'C#': ['csharp', 'c sharp'],
+    'AWS': ['amazon web services'],
+    'Django REST Framework': ['drf', 'django rest'],
+    'Machine Learning': ['ml'],
+}
+
+
+def seed_aliases(apps, schema_editor):
+    Skill = apps.get_model('jobs', 'Skill')
+    SkillAlias = apps.get_model('jobs', 'SkillAlias')
+    for name, aliases in ALIASES.items():
+        skill, _ = Skill.objects.get_or_create(slug=name.lower(), defaults={'name': name})
+        SkillAlias.objects.bulk_create([SkillAlias(alias=alias, skill=skill) for alias in aliases],
+                                       ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0013_application_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='VacancySkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('skill', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='jobs.skill')),
+                ('vacancy', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='jobs.vacancy')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SkillAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='jobs.skill')),
+            ],
+            options={
+                'verbose_name_plural': 'skill aliases',
+            },
+        ),
+        migrations.AddField(
+            model_name='vacancy',
+            name='skill_tags',
+            field=models.ManyToManyField(blank=True, related_name='vacancies', through='jobs.VacancySkill', to='jobs.skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='vacancyskill',
+            constraint=models.UniqueConstraint(fields=('skill', 'vacancy'), name='unique_vacancy_skill'),
+        ),
+        migrations.RunPython(seed_aliases, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,9 @@
+from datetime import date
 from enum import Enum
 
 from django.db import models
 from django.contrib.auth.models import User
+from django.contrib.postgres.search import SearchVectorField
 
 
 class VacancyType(Enum):
@@ -10,6 +12,21 @@ class VacancyType(Enum):
     office = "Office"
 
 
+class VacancyStatus(Enum):
+    upcoming = "upcoming"
+    open = "open"
+    closed = "closed"
+
+
+class UploadStatus(Enum):
+    pending = "pending"
+    ready = "ready"
+    failed = "failed"
+
+
+UPLOAD_STATUS_CHOICES = [(status.value, status.value.title()) for status in UploadStatus]
+
+
 class TechStack(Enum):
     PYTHON = "Python"
     JAVASCRIPT = "JavaScript"
@@ -25,6 +42,13 @@ class TechStack(Enum):
     OTHER = "Other"
 
 
+class LiveManager(models.Manager):
+    """Default manager that hides soft-deleted rows; ``all_objects`` still sees them."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class JobSearcher(models.Model):
     user = models.ForeignKey(
         to=User,
@@ -32,8 +56,15 @@ class JobSearcher(models.Model):
     )
     phone = models.CharField(max_length=20)
     image = models.ImageField(upload_to="", null=True)
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default=UploadStatus.ready.value)
     gender = models.CharField(max_length=10)
     type = models.CharField(max_length=15)
+    skills = models.CharField(max_length=200, blank=True)
+    experience = models.PositiveSmallIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.user.first_name
@@ -46,17 +77,54 @@ class Recruiter(models.Model):
     )
     phone = models.CharField(max_length=20)
     image = models.ImageField(upload_to="")
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default=UploadStatus.ready.value)
     gender = models.CharField(max_length=10)
     type = models.CharField(max_length=15)
     status = models.CharField(max_length=20)
     company_name = models.CharField(max_length=100)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status'], name='recruiter_status_idx'),
+        ]
 
     def __str__(self):
         return self.user.username
 
 
+class Skill(models.Model):
+    """Canonical skill; ``slug`` is the normalised name that skill filters use."""
+    name = models.CharField(max_length=100)
+    slug = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    """Another spelling of a skill (e.g. 'k8s' for Kubernetes), stored normalised."""
+    alias = models.CharField(max_length=100, unique=True)
+    skill = models.ForeignKey(
+        to=Skill,
+        on_delete=models.CASCADE,
+        related_name='aliases'
+    )
+
+    class Meta:
+        verbose_name_plural = 'skill aliases'
+
+    def __str__(self):
+        return self.alias
+
+
 class Vacancy(models.Model):
 
+    STATUS_CHOICES = [(status.value, status.value.title()) for status in VacancyStatus]
+
     VACANCY_TYPE_CHOICES = [
         (VacancyType.remote.value, 'Remote'),
         (VacancyType.hybrid.value, 'Hybrid'),
@@ -78,6 +146,7 @@ class Vacancy(models.Model):
     )
     salary = models.FloatField()
     company_logo = models.ImageField(upload_to="")
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default=UploadStatus.ready.value)
     description = models.TextField(max_length=400)
     experience = models.CharField(max_length=100)
     location = models.CharField(max_length=100)
@@ -88,15 +157,74 @@ class Vacancy(models.Model):
         default=TechStack.OTHER.value,
     )
     creation_date = models.DateField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     start_date = models.DateField()
     end_date = models.DateField()
+    # Set on save and advanced by the sweep_vacancies command as dates pass.
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=VacancyStatus.open.value,
+                              editable=False)
+    # Maintained by jobs.search; the GIN index is created in migration 0006 on PostgreSQL only.
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Canonical skills parsed from ``skills``, kept in sync by jobs.skills.
+    skill_tags = models.ManyToManyField(Skill, through='VacancySkill', related_name='vacancies', blank=True)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-start_date', '-id'], name='vacancy_start_date_id_idx'),
+            models.Index(fields=['end_date'], name='vacancy_end_date_idx'),
+            models.Index(fields=['updated_at'], name='vacancy_updated_at_idx'),
+            models.Index(fields=['-start_date', '-id'], name='vacancy_live_open_idx',
+                         condition=models.Q(status=VacancyStatus.open.value, deleted_at__isnull=True)),
+        ]
 
     def __str__(self):
         return self.title
 
+    def current_status(self, today=None):
+        today = today or date.today()
+        start_date = self._meta.get_field('start_date').to_python(self.start_date)
+        end_date = self._meta.get_field('end_date').to_python(self.end_date)
+        if end_date < today:
+            return VacancyStatus.closed.value
+        if start_date > today:
+            return VacancyStatus.upcoming.value
+        return VacancyStatus.open.value
+
+    def save(self, *args, **kwargs):
+        self.status = self.current_status()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' not in update_fields:
+            kwargs['update_fields'] = list(update_fields) + ['status']
+        super().save(*args, **kwargs)
+
+
+class VacancySkill(models.Model):
+    vacancy = models.ForeignKey(
+        to=Vacancy,
+        on_delete=models.CASCADE
+    )
+    # The unique (skill, vacancy) index serves skill filters, so no separate index on skill.
+    skill = models.ForeignKey(
+        to=Skill,
+        on_delete=models.CASCADE,
+        db_index=False
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['skill', 'vacancy'], name='unique_vacancy_skill'),
+        ]
+
 
 class Application(models.Model):
-    company = models.CharField(max_length=200, default="")
+    company = models.ForeignKey(
+        to=Recruiter,
+        on_delete=models.CASCADE
+    )
     vacancy = models.ForeignKey(
         to=Vacancy,
         on_delete=models.CASCADE
@@ -106,7 +234,75 @@ class Application(models.Model):
         on_delete=models.CASCADE
     )
     resume = models.ImageField(upload_to="")
+    upload_status = models.CharField(max_length=10, choices=UPLOAD_STATUS_CHOICES, default=UploadStatus.ready.value)
     application_date = models.DateField()
+    # Match against the vacancy, written in batches by jobs.ranking; unscored rows have scored_at unset.
+    score = models.FloatField(default=0, editable=False)
+    scored_at = models.DateTimeField(null=True, editable=False)
+    deleted_at = models.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['applicant', 'vacancy'], name='unique_application'),
+        ]
+        indexes = [
+            models.Index(fields=['company', '-score', '-id'], name='application_company_score_idx',
+                         condition=models.Q(deleted_at__isnull=True)),
+            models.Index(fields=['vacancy', '-score', '-id'], name='application_vacancy_score_idx',
+                         condition=models.Q(deleted_at__isnull=True)),
+            models.Index(fields=['scored_at'], name='application_scored_at_idx'),
+        ]
 
     def __str__(self):
         return str(self.applicant)
+
+
+class VacancyStats(models.Model):
+    """Per-vacancy application totals, maintained by jobs.dashboard."""
+    vacancy = models.OneToOneField(
+        to=Vacancy,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    company = models.ForeignKey(
+        to=Recruiter,
+        on_delete=models.CASCADE
+    )
+    applications = models.PositiveIntegerField(default=0)
+    first_application_date = models.DateField(null=True)
+
+
+class DailyApplicationStats(models.Model):
+    """Applications received by a company per day, maintained by jobs.dashboard."""
+    company = models.ForeignKey(
+        to=Recruiter,
+        on_delete=models.CASCADE
+    )
+    day = models.DateField()
+    applications = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['company', 'day'], name='unique_daily_application_stats'),
+        ]
+
+
+class ModerationEvent(models.Model):
+    """Audit trail of recruiter status changes, written by jobs.moderation."""
+    company = models.ForeignKey(
+        to=Recruiter,
+        on_delete=models.CASCADE,
+        related_name='moderation_events'
+    )
+    moderator = models.ForeignKey(
+        to=User,
+        on_delete=models.SET_NULL,
+        null=True
+    )
+    previous_status = models.CharField(max_length=20)
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
@@ -0,0 +1,34 @@
+from django.db import connection, transaction
+
+from .cache import bump_version
+from .models import ModerationEvent, Recruiter
+from .profiles import forget
+
+
+STATUSES = ('pending', 'Accepted', 'Rejected')
+
+
+def change_status(companies, status, moderator=None):
+    """
+    Set ``status`` on every recruiter in the ``companies`` queryset that does
+    not already have it, and record one ModerationEvent per change. Runs one
+    UPDATE ... WHERE id IN (...) and one INSERT per batch, in one
+    transaction; batches only split where the database caps the number of
+    query parameters. Returns the number of recruiters changed.
+    """
+    if status not in STATUSES:
+        raise ValueError("Unknown status %r." % status)
+    with transaction.atomic():
+        changed = list(companies.exclude(status=status).select_for_update().values_list('id', 'status'))
+        batch_size = connection.features.max_query_params or len(changed) or 1
+        for start in range(0, len(changed), batch_size):
+            ids = [pk for pk, _ in changed[start:start + batch_size]]
+            Recruiter.objects.filter(id__in=ids).update(status=status)
+        ModerationEvent.objects.bulk_create(
+            [ModerationEvent(company_id=pk, moderator=moderator, previous_status=previous, status=status)
+             for pk, previous in changed],
+            batch_size=1000)
+    if changed:
+        forget(*Recruiter.objects.filter(id__in=[pk for pk, _ in changed]).values_list('user_id', flat=True))
+        bump_version('recruiters')
+    return len(changed)
@@ -0,0 +1,111 @@
+import base64
+import binascii
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+def get_page_size(request, default=None, maximum=None):
+    default = default or getattr(settings, 'JOB_BOARD_PAGE_SIZE', 25)
+    maximum = maximum or getattr(settings, 'JOB_BOARD_MAX_PAGE_SIZE', 100)
+    try:
+        page_size = int(request.GET.get('page_size', default))
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(page_size, maximum))
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+
+class KeysetPaginator:
+    """
+    Cursor pagination over a descending composite key, e.g. ('start_date', 'id').
+
+    Each page is fetched with a single indexed range query, so the cost of a
+    page does not depend on how deep into the result set it is.
+    """
+
+    def __init__(self, queryset, page_size, keys=('start_date', 'id')):
+        self.queryset = queryset
+        self.page_size = page_size
+        self.keys = tuple(keys)
+
+    def encode_cursor(self, obj):
+        raw = '|'.join(str(getattr(obj, key)) for key in self.keys)
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            values = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+        if len(values) != len(self.keys):
+            return None
+        opts = self.queryset.model._meta
+        try:
+            return [opts.get_field(key).to_python(value) for key, value in zip(self.keys, values)]
+        except ValidationError:
+            return None
+
+    def _seek(self, values, lookup):
+        condition = Q()
+        for i, key in enumerate(self.keys):
+            term = Q(**{'%s__%s' % (key, lookup): values[i]})
+            for prev_key, prev_value in zip(self.keys[:i], values[:i]):
+                term &= Q(**{prev_key: prev_value})
+            condition |= term
+        return condition
+
+    def _query(self, after, before):
+        """Return (queryset, reverse, seeking) for the requested page."""
+        after_values = self.decode_cursor(after) if after else None
+        before_values = self.decode_cursor(before) if before else None
+        if before_values is not None:
+            queryset = self.queryset.filter(self._seek(before_values, 'gt')).order_by(*self.keys)
+            return queryset[:self.page_size + 1], True, True
+        queryset = self.queryset
+        if after_values is not None:
+            queryset = queryset.filter(self._seek(after_values, 'lt'))
+        queryset = queryset.order_by(*['-%s' % key for key in self.keys])
+        return queryset[:self.page_size + 1], False, after_values is not None
+
+    def _page(self, rows, reverse, seeking):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows = rows[::-1]
+            previous_cursor = self.encode_cursor(rows[0]) if has_more and rows else None
+            next_cursor = self.encode_cursor(rows[-1]) if rows else None
+        else:
+            next_cursor = self.encode_cursor(rows[-1]) if has_more else None
+            previous_cursor = self.encode_cursor(rows[0]) if seeking and rows else None
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def page(self, after=None, before=None):
+        queryset, reverse, seeking = self._query(after, before)
+        return self._page(list(queryset), reverse, seeking)
+
+    async def apage(self, after=None, before=None):
+        queryset, reverse, seeking = self._query(after, before)
+        return self._page([row async for row in queryset], reverse, seeking)
@@ -0,0 +1,100 @@
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import login
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.http import Http404
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import SimpleLazyObject
+
+from .models import JobSearcher, Recruiter
+
+
+ROLES = {'applicant': JobSearcher, 'company': Recruiter}
+MODEL_ROLES = {model: role for role, model in ROLES.items()}
+# Role of the logged-in profile, stored in the session at login so the
+# profile is looked up in one table only.
+SESSION_KEY = '_profile_role'
+
+
+def _timeout():
+    return getattr(settings, 'AUTH_CACHE_TIMEOUT', 0)
+
+
+def _profile_key(user_id):
+    return 'jobs:profile:%s' % user_id
+
+
+def _user_key(user_id):
+    return 'jobs:user:%s' % user_id
+
+
+def forget(*user_ids):
+    """Drop the cached User and profile of ``user_ids``; call after updating them in bulk."""
+    if user_ids:
+        cache.delete_many([key for user_id in user_ids for key in (_profile_key(user_id), _user_key(user_id))])
+
+
+def get_profile(user, role=None):
+    """
+    The JobSearcher or Recruiter of ``user``, or None. Cached for
+    AUTH_CACHE_TIMEOUT seconds and dropped when the profile or user changes.
+    """
+    if not user.is_authenticated:
+        return None
+    timeout = _timeout()
+    if timeout:
+        cached = cache.get(_profile_key(user.pk))
+        if cached is not None:
+            return cached[0]
+    profile = None
+    for model in [ROLES[role]] if role in ROLES else ROLES.values():
+        profile = model.objects.select_related('user').filter(user=user).first()
+        if profile is not None:
+            break
+    if timeout:
+        cache.set(_profile_key(user.pk), (profile,), timeout)
+    return profile
+
+
+def request_profile(request, model=None):
+    """The profile of the logged-in user, looked up once per request; 404 if it is not a ``model``."""
+    if not hasattr(request, '_cached_profile'):
+        role = request.session.get(SESSION_KEY, MODEL_ROLES.get(model))
+        request._cached_profile = get_profile(request.user, role)
+    profile = request._cached_profile
+    if model is not None and not isinstance(profile, model):
+        raise Http404("No %s profile for this account." % model._meta.verbose_name)
+    return profile
+
+
+async def arequest_profile(request, model=None):
+    return await sync_to_async(request_profile)(request, model)
+
+
+def login_profile(request, user, profile):
+    login(request, user)
+    request.session[SESSION_KEY] = profile.type
+    request._cached_profile = profile
+
+
+class ProfileMiddleware(MiddlewareMixin):
+    """Set ``request.profile``, resolved on first use; must come after AuthenticationMiddleware."""
+
+    def process_request(self, request):
+        request.profile = SimpleLazyObject(lambda: request_profile(request))
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend that serves the per-request User lookup from the cache."""
+
+    def get_user(self, user_id):
+        timeout = _timeout()
+        if not timeout:
+            return super().get_user(user_id)
+        user = cache.get(_user_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(_user_key(user_id), user, timeout)
+        return user
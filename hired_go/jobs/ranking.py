@@ -0,0 +1,87 @@
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Application, TechStack
+from .search import tokenize
+
+
+YEARS_RE = re.compile(r'\d+')
+
+
+def weights():
+    return getattr(settings, 'RANKING_WEIGHTS', {'skills': 0.6, 'experience': 0.25, 'recency': 0.15})
+
+
+def required_years(text):
+    match = YEARS_RE.search(text or '')
+    return int(match.group()) if match else 0
+
+
+def skill_overlap(applicant, vacancy):
+    """Share of the vacancy's skills (and tech stack) listed by the applicant."""
+    wanted = set(tokenize(vacancy.skills))
+    if vacancy.tech_stack != TechStack.OTHER.value:
+        wanted.update(tokenize(vacancy.tech_stack))
+    if not wanted:
+        return 1.0
+    return len(wanted & set(tokenize(applicant.skills))) / len(wanted)
+
+
+def experience_match(applicant, vacancy):
+    required = required_years(vacancy.experience)
+    if not required:
+        return 1.0
+    if applicant.experience is None:
+        return 0.0
+    return min(applicant.experience / required, 1.0)
+
+
+def recency(application, today):
+    half_life = getattr(settings, 'RANKING_RECENCY_HALF_LIFE', 14)
+    return 0.5 ** (max((today - application.application_date).days, 0) / half_life)
+
+
+def score_application(application, today):
+    factors = {
+        'skills': skill_overlap(application.applicant, application.vacancy),
+        'experience': experience_match(application.applicant, application.vacancy),
+        'recency': recency(application, today),
+    }
+    return round(sum(weight * factors[name] for name, weight in weights().items()), 4)
+
+
+def mark_unscored(**filters):
+    """Queue the applications matching ``filters`` for the next score_applications run."""
+    Application.objects.filter(**filters).exclude(scored_at=None).update(scored_at=None)
+
+
+def score_applications(batch_size=500, rescore_after=None, now=None):
+    """
+    Score new applications and those scored more than ``rescore_after``
+    seconds ago (so recency stays current), ``batch_size`` rows per UPDATE.
+    Returns the number of applications scored.
+    """
+    now = now or timezone.now()
+    if rescore_after is None:
+        rescore_after = getattr(settings, 'RANKING_RESCORE_AFTER', 24 * 60 * 60)
+    pending = (Application.objects.filter(Q(scored_at=None) | Q(scored_at__lt=now - timedelta(seconds=rescore_after)))
+               .select_related('vacancy', 'applicant')
+               .only('id', 'application_date', 'vacancy__skills', 'vacancy__tech_stack', 'vacancy__experience',
+                     'applicant__skills', 'applicant__experience')
+               .order_by('id'))
+    today = timezone.localdate(now)
+    total, last = 0, 0
+    while True:
+        batch = list(pending.filter(id__gt=last)[:batch_size])
+        if not batch:
+            return total
+        for application in batch:
+            application.score = score_application(application, today)
+            application.scored_at = now
+        Application.objects.bulk_update(batch, ['score', 'scored_at'])
+        total += len(batch)
+        last = batch[-1].id
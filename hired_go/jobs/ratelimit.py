@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+
+
+logger = logging.getLogger(__name__)
+
+# scope -> {key kind: (capacity, period)}: each bucket allows ``capacity``
+# requests in any ``period`` seconds.
+DEFAULT_LIMITS = {
+    'login': {'ip': (20, 60), 'account': (5, 300)},
+    'signup': {'ip': (5, 3600)},
+    'apply': {'ip': (30, 60), 'account': (10, 60)},
+}
+
+# Larger bodies (uploads) are not parsed to find the account; they only count against the IP bucket.
+MAX_PARSED_BODY = 16 * 1024
+
+
+def limits():
+    return getattr(settings, 'RATE_LIMITS', DEFAULT_LIMITS)
+
+
+def _store():
+    return caches[getattr(settings, 'RATE_LIMIT_CACHE', 'default')]
+
+
+def _count(store, key, timeout):
+    count = 1
+    if not store.add(key, count, timeout):
+        try:
+            count = store.incr(key)
+        except ValueError:
+            # Expired between add() and incr(): this request opens it again.
+            store.add(key, count, timeout)
+    return count
+
+
+def take(key, capacity, period, now=None):
+    """
+    Count a request against bucket ``key``, a sliding window of ``period``
+    seconds. Requests are counted per fixed window with add() and incr(),
+    which are atomic in shared caches, and the previous window's count is
+    weighted by how much of it the sliding window still covers, so a client
+    cannot spend two windows' worth across a boundary. Rejected requests
+    count too. Returns 0 when there was room, otherwise the seconds until
+    the next request would fit.
+    """
+    now = time.time() if now is None else now
+    store = _store()
+    window = int(now // period)
+    elapsed = now - window * period
+    # Kept for two periods: the next window still reads it as the previous one.
+    count = _count(store, '%s:%d' % (key, window), 2 * period)
+    previous = store.get('%s:%d' % (key, window - 1), 0)
+    if previous * (period - elapsed) / period + count <= capacity:
+        return 0
+    room = capacity - count - 1
+    if room >= 0:
+        # The previous window has to slide out far enough within this one.
+        return period * (1 - room / previous) - elapsed
+    # This window is full on its own: wait until enough of it has slid out.
+    return period - elapsed + period * (1 - max(capacity - 1, 0) / count)
+
+
+def client_ip(request):
+    """
+    The client address. Behind RATE_LIMIT_TRUSTED_PROXIES proxies that each
+    append to RATE_LIMIT_IP_HEADER, it is the entry added by the outermost
+    trusted proxy; anything to its left was sent by the client.
+    """
+    header = getattr(settings, 'RATE_LIMIT_IP_HEADER', None)
+    if header and request.META.get(header):
+        hops = [hop.strip() for hop in request.META[header].split(',') if hop.strip()]
+        if hops:
+            return hops[-min(getattr(settings, 'RATE_LIMIT_TRUSTED_PROXIES', 1), len(hops))]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def account(request):
+    """
+    The account a request acts for: the logged-in user, or the username or
+    email posted in a small form body.
+    """
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return 'user:%s' % user.pk
+    try:
+        length = int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return None
+    if length > MAX_PARSED_BODY:
+        return None
+    name = request.POST.get('username') or request.POST.get('email')
+    return 'name:%s' % name.strip().lower() if name else None
+
+
+IDENTIFIERS = {'ip': client_ip, 'account': account}
+
+
+def _key(scope, kind, identifier):
+    return 'jobs:ratelimit:%s:%s:%s' % (scope, kind, hashlib.md5(identifier.encode()).hexdigest())
+
+
+def _metric_key(scope, kind):
+    return 'jobs:stats:ratelimit:%s:%s' % (scope, kind)
+
+
+def record_rejection(scope, kind):
+    store = _store()
+    key = _metric_key(scope, kind)
+    if not store.add(key, 1, None):
+        try:
+            store.incr(key)
+        except ValueError:
+            store.set(key, 1, None)
+
+
+def stats():
+    """Rejected requests so far as {scope: {kind: count}}."""
+    keys = {(scope, kind): _metric_key(scope, kind) for scope, buckets in limits().items() for kind in buckets}
+    values = _store().get_many(keys.values())
+    result = {}
+    for (scope, kind), key in keys.items():
+        result.setdefault(scope, {})[kind] = values.get(key, 0)
+    return result
+
+
+def check(request, scope):
+    """Count the request in every bucket of ``scope``; returns 0, or seconds to wait if one is full."""
+    for kind, (capacity, period) in limits().get(scope, {}).items():
+        identifier = IDENTIFIERS[kind](request)
+        if not identifier:
+            continue
+        wait = take(_key(scope, kind, identifier), capacity, period)
+        if wait:
+            record_rejection(scope, kind)
+            logger.warning("Rate limit %s/%s exceeded by %s", scope, kind, client_ip(request))
+            return wait
+    return 0
+
+
+class RateLimitMiddleware(MiddlewareMixin):
+    """
+    Throttle POSTs to views with a ``rate_limit`` scope. Must come before
+    CsrfViewMiddleware: rejected requests then stop before the body is
+    parsed, a password is hashed or an upload is written.
+    """
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        scope = getattr(getattr(view_func, 'view_class', view_func), 'rate_limit', None)
+        if scope is None or request.method != 'POST':
+            return None
+        wait = check(request, scope)
+        if not wait:
+            return None
+        response = HttpResponse("Too many attempts. Please try again later.", status=429,
+                                content_type='text/plain')
+        response['Retry-After'] = str(math.ceil(wait))
+        return response
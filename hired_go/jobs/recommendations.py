@@ -0,0 +1,283 @@
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.models import Max
+
+from .cache import get_versions
+from .models import Application, Vacancy, VacancyStatus
+from .search import tokenize
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+logger = logging.getLogger(__name__)
+
+# Token weights per field; tech_stack is a single enum value, so it counts as one strong token.
+SKILL_FIELDS = (
+    ('skills', 1.0),
+    ('tech_stack', 1.0),
+    ('title', 0.5),
+)
+
+
+def skill_vector(vacancy):
+    """Sparse vector of a vacancy as {token: weight}, from values or a model instance."""
+    vector = defaultdict(float)
+    for field, weight in SKILL_FIELDS:
+        value = vacancy[field] if isinstance(vacancy, dict) else getattr(vacancy, field)
+        for token in tokenize(value):
+            vector[token] += weight
+    return vector
+
+
+class SkillMatrix:
+    """
+    Open vacancies as rows of a sparse token matrix, stored column-wise: for
+    each token, the rows containing it and their weights. Scoring a profile
+    only touches the columns of the profile's tokens. Rows are appended and
+    masked out in place, and the matrix is rebuilt once half of it is stale
+    or it is older than RECOMMENDATION_MAX_AGE. Rebuilds run in a background
+    thread into a fresh matrix that is swapped in when done; requests keep
+    scoring against the current one meanwhile.
+
+    Each process holds its own matrix. Changes made elsewhere (other workers,
+    cron, imports) are picked up through the shared 'vacancies' version and
+    Vacancy.updated_at, see refresh().
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.build_lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.pks = []
+        self.rows = {}
+        self.norms = []
+        self.active = []
+        self.columns = defaultdict(lambda: ([], []))
+        self.arrays = {}
+        self.mask = None
+        self.built_at = None
+        # The 'vacancies' version and the latest Vacancy.updated_at the rows reflect.
+        self.version = None
+        self.synced_through = None
+        # Vacancies indexed or removed while a rebuild runs, replayed on the fresh matrix.
+        self.changed = None
+
+    def _add(self, pk, vector):
+        self._remove(pk)
+        row = len(self.pks)
+        self.pks.append(pk)
+        self.rows[pk] = row
+        self.norms.append(math.sqrt(sum(weight * weight for weight in vector.values())) or 1.0)
+        self.active.append(True)
+        for token, weight in vector.items():
+            rows, weights = self.columns[token]
+            rows.append(row)
+            weights.append(weight)
+            self.arrays.pop(token, None)
+        self.mask = None
+
+    def _remove(self, pk):
+        row = self.rows.pop(pk, None)
+        if row is not None:
+            self.active[row] = False
+            self.mask = None
+
+    def _open_vacancies(self, queryset):
+        return (queryset.filter(status=VacancyStatus.open.value)
+                .values('id', *[field for field, _ in SKILL_FIELDS]).iterator(chunk_size=5000))
+
+    def rebuild(self, only_if_stale=False):
+        with self.build_lock:
+            if only_if_stale and not self._stale():
+                return
+            with self.lock:
+                self.changed = set()
+            fresh = SkillMatrix()
+            fresh.version, = get_versions('vacancies')
+            fresh.synced_through = self._last_update()
+            for row in self._open_vacancies(Vacancy.objects.all()):
+                fresh._add(row['id'], skill_vector(row))
+            fresh.built_at = time.monotonic()
+            with self.lock:
+                fresh._index(self.changed)
+                for name in ('pks', 'rows', 'norms', 'active', 'columns', 'arrays', 'mask', 'built_at', 'version',
+                             'synced_through'):
+                    setattr(self, name, getattr(fresh, name))
+                self.changed = None
+
+    def _last_update(self):
+        return Vacancy.all_objects.aggregate(last=Max('updated_at'))['last']
+
+    def refresh(self):
+        """
+        Re-read the vacancies updated since the matrix was last synced, once
+        the shared 'vacancies' version has moved. Rows are re-read from a
+        RECOMMENDATION_SYNC_OVERLAP margin before the last update seen, so
+        transactions committed slightly out of order are not missed. Hard
+        deleted vacancies stay until the next rebuild; recommend() skips them.
+        """
+        version, = get_versions('vacancies')
+        if version == self.version or not self.build_lock.acquire(blocking=False):
+            return
+        try:
+            last = self._last_update()
+            changed = Vacancy.all_objects.all()
+            if self.synced_through is not None:
+                overlap = timedelta(seconds=getattr(settings, 'RECOMMENDATION_SYNC_OVERLAP', 60))
+                changed = changed.filter(updated_at__gte=self.synced_through - overlap)
+            changed = list(changed.values_list('id', flat=True))
+            with self.lock:
+                self._index(changed)
+                self.version = version
+                self.synced_through = last or self.synced_through
+        finally:
+            self.build_lock.release()
+
+    def rebuild_later(self):
+        """Start a background rebuild unless one is already running."""
+        if not self.build_lock.locked():
+            threading.Thread(target=self._rebuild_in_background, name='recommendation-rebuild', daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            self.rebuild(only_if_stale=True)
+        except Exception:
+            logger.exception("Could not rebuild the recommendation matrix")
+        finally:
+            connections.close_all()
+
+    def _index(self, pks):
+        for pk in pks:
+            self._remove(pk)
+        if pks:
+            for row in self._open_vacancies(Vacancy.objects.filter(pk__in=pks)):
+                self._add(row['id'], skill_vector(row))
+
+    def index(self, pks):
+        with self.lock:
+            if self.changed is not None:
+                self.changed.update(pks)
+            if self.built_at is not None:
+                self._index(pks)
+
+    def remove(self, pks):
+        with self.lock:
+            if self.changed is not None:
+                self.changed.update(pks)
+            for pk in pks:
+                self._remove(pk)
+
+    def _stale(self):
+        if self.built_at is None:
+            return True
+        if time.monotonic() - self.built_at > getattr(settings, 'RECOMMENDATION_MAX_AGE', 3600):
+            return True
+        return len(self.rows) * 2 < len(self.pks)
+
+    def top(self, profile, k, exclude=()):
+        """Return up to ``k`` vacancy ids by cosine similarity to ``profile``, best first."""
+        if self.built_at is None:
+            # Nothing to serve yet: build once, concurrent callers wait for it.
+            self.rebuild(only_if_stale=True)
+        elif self._stale():
+            self.rebuild_later()
+        else:
+            self.refresh()
+        with self.lock:
+            if numpy is not None:
+                return self._top_numpy(profile, k, exclude)
+            return self._top_python(profile, k, exclude)
+
+    def _column(self, token):
+        if token not in self.arrays:
+            rows, weights = self.columns[token]
+            self.arrays[token] = (numpy.array(rows, dtype=numpy.int64), numpy.array(weights, dtype=numpy.float32))
+        return self.arrays[token]
+
+    def _top_numpy(self, profile, k, exclude):
+        if self.mask is None:
+            self.mask = numpy.array(self.active, dtype=bool)
+            self.inverse_norms = 1.0 / numpy.array(self.norms, dtype=numpy.float32)
+        scores = numpy.zeros(len(self.pks), dtype=numpy.float32)
+        for token, weight in profile.items():
+            if token in self.columns:
+                rows, weights = self._column(token)
+                scores[rows] += weight * weights
+        scores *= self.inverse_norms
+        scores[~self.mask] = 0
+        for pk in exclude:
+            if pk in self.rows:
+                scores[self.rows[pk]] = 0
+        k = min(k, len(scores))
+        if not k:
+            return []
+        candidates = numpy.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[numpy.argsort(-scores[candidates], kind='stable')]
+        return [self.pks[row] for row in candidates if scores[row] > 0]
+
+    def _top_python(self, profile, k, exclude):
+        scores = defaultdict(float)
+        for token, weight in profile.items():
+            rows, weights = self.columns.get(token, ((), ()))
+            for row, value in zip(rows, weights):
+                scores[row] += weight * value
+        excluded = {self.rows[pk] for pk in exclude if pk in self.rows}
+        candidates = ((score / self.norms[row], row) for row, score in scores.items()
+                      if self.active[row] and row not in excluded)
+        return [self.pks[row] for score, row in heapq.nlargest(k, candidates)]
+
+
+matrix = SkillMatrix()
+
+
+def applicant_profile(applicant):
+    """Sum of the skill vectors of the applicant's most recent applications."""
+    history = getattr(settings, 'RECOMMENDATION_HISTORY', 50)
+    applied = (Application.objects.filter(applicant=applicant).order_by('-application_date', '-id')
+               .values_list('vacancy_id', *['vacancy__%s' % field for field, _ in SKILL_FIELDS])[:history])
+    profile = defaultdict(float)
+    seen = []
+    for vacancy_id, *values in applied:
+        seen.append(vacancy_id)
+        for token, weight in skill_vector(dict(zip([field for field, _ in SKILL_FIELDS], values))).items():
+            profile[token] += weight
+    return profile, seen
+
+
+def recommended_ids(applicant, count=None):
+    count = count or getattr(settings, 'RECOMMENDATION_COUNT', 10)
+    profile, seen = applicant_profile(applicant)
+    if not profile:
+        return []
+    return matrix.top(profile, count, exclude=seen)
+
+
+def recommend(applicant, count=None):
+    """
+    Open vacancies the applicant has not applied to, most similar to what they
+    applied to before. The id list is cached per applicant until they apply
+    again or any vacancy changes.
+    """
+    versions = get_versions('vacancies', 'applicant:%s' % applicant.pk)
+    key = 'jobs:recommendations:%s:%s' % (applicant.pk, ':'.join(str(version) for version in versions))
+    ids = cache.get(key)
+    if ids is None:
+        ids = recommended_ids(applicant, count)
+        cache.set(key, ids, getattr(settings, 'RECOMMENDATION_CACHE_TIMEOUT', 600))
+    found = Vacancy.objects.filter(id__in=ids, status=VacancyStatus.open.value).select_related('company_name')
+    found = found.in_bulk()
+    return [found[pk] for pk in ids if pk in found]
@@ -0,0 +1,172 @@
+import heapq
+import re
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import connection
+
+from .models import Vacancy
+
+
+# Field weights follow PostgreSQL's A-D ranking classes.
+SEARCH_FIELDS = (
+    ('title', 'A'),
+    ('skills', 'B'),
+    ('tech_stack', 'B'),
+    ('location', 'C'),
+    ('description', 'D'),
+)
+WEIGHT_VALUES = {'A': 1.0, 'B': 0.4, 'C': 0.2, 'D': 0.1}
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def tokenize(text):
+    return [token.rstrip('.') for token in TOKEN_RE.findall((text or '').lower())]
+
+
+def max_results():
+    return getattr(settings, 'JOB_SEARCH_MAX_RESULTS', 1000)
+
+
+class PostgresSearchBackend:
+    """
+    Ranks against Vacancy.search_vector, a tsvector column kept up to date by
+    the Vacancy post_save signal and backed by a GIN index.
+    """
+
+    def __init__(self):
+        from django.contrib.postgres.search import SearchVector
+
+        self.config = getattr(settings, 'JOB_SEARCH_CONFIG', 'english')
+        vector = None
+        for field, weight in SEARCH_FIELDS:
+            term = SearchVector(field, weight=weight, config=self.config)
+            vector = term if vector is None else vector + term
+        self.vector = vector
+
+    def index(self, pks):
+        Vacancy.objects.filter(pk__in=pks).update(search_vector=self.vector)
+
+    def remove(self, pks):
+        pass
+
+    def rebuild(self, batch_size=5000):
+        last_id = 0
+        while True:
+            pks = list(Vacancy.objects.filter(pk__gt=last_id).order_by('pk')
+                       .values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            Vacancy.objects.filter(pk__gte=pks[0], pk__lte=pks[-1]).update(search_vector=self.vector)
+            last_id = pks[-1]
+
+    def search(self, text):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+        from django.db.models import F
+
+        query = SearchQuery(text, search_type='websearch', config=self.config)
+        return (Vacancy.objects.filter(search_vector=query)
+                .annotate(rank=SearchRank(F('search_vector'), query))
+                .order_by('-rank', '-start_date', '-id')
+                .values_list('id', flat=True)[:max_results()])
+
+
+class InvertedIndexBackend:
+    """
+    In-process inverted index for databases without full-text search (the
+    SQLite test runs). Built lazily on first search, then updated per vacancy.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.postings = defaultdict(dict)
+        self.documents = {}
+        self.start_dates = {}
+        self.built = False
+
+    def _terms(self, vacancy):
+        terms = defaultdict(float)
+        for field, weight in SEARCH_FIELDS:
+            for token in tokenize(getattr(vacancy, field)):
+                terms[token] += WEIGHT_VALUES[weight]
+        return terms
+
+    def _add(self, vacancy):
+        self._remove(vacancy.pk)
+        terms = self._terms(vacancy)
+        for token, score in terms.items():
+            self.postings[token][vacancy.pk] = score
+        self.documents[vacancy.pk] = tuple(terms)
+        self.start_dates[vacancy.pk] = vacancy.start_date
+
+    def _remove(self, pk):
+        for token in self.documents.pop(pk, ()):
+            postings = self.postings[token]
+            postings.pop(pk, None)
+            if not postings:
+                del self.postings[token]
+        self.start_dates.pop(pk, None)
+
+    def _vacancies(self, queryset, chunk_size=2000):
+        fields = [field for field, _ in SEARCH_FIELDS]
+        return queryset.only('id', 'start_date', *fields).iterator(chunk_size=chunk_size)
+
+    def index(self, pks):
+        with self.lock:
+            if not self.built:
+                return
+            for vacancy in self._vacancies(Vacancy.objects.filter(pk__in=pks)):
+                self._add(vacancy)
+
+    def remove(self, pks):
+        with self.lock:
+            for pk in pks:
+                self._remove(pk)
+
+    def rebuild(self, batch_size=2000):
+        with self.lock:
+            self.postings.clear()
+            self.documents.clear()
+            self.start_dates.clear()
+            for vacancy in self._vacancies(Vacancy.objects.all(), batch_size):
+                self._add(vacancy)
+            self.built = True
+
+    def search(self, text):
+        if not self.built:
+            self.rebuild()
+        tokens = set(tokenize(text))
+        if not tokens:
+            return []
+        with self.lock:
+            postings = sorted((self.postings.get(token, {}) for token in tokens), key=len)
+            if not postings[0]:
+                return []
+            scores = dict(postings[0])
+            for other in postings[1:]:
+                scores = {pk: score + other[pk] for pk, score in scores.items() if pk in other}
+            start_dates = self.start_dates
+            return heapq.nlargest(max_results(), scores, key=lambda pk: (scores[pk], start_dates[pk], pk))
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                name = getattr(settings, 'JOB_SEARCH_BACKEND', None)
+                if name is None:
+                    name = 'postgres' if connection.vendor == 'postgresql' else 'inverted_index'
+                _backend = PostgresSearchBackend() if name == 'postgres' else InvertedIndexBackend()
+    return _backend
+
+
+def search_vacancies(text):
+    """Return vacancy ids matching ``text``, best match first."""
+    return get_backend().search(text)
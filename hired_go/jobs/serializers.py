@@ -0,0 +1,45 @@
+from rest_framework import serializers
+
+from .models import Application, Recruiter, Vacancy
+
+
+class SparseFieldsetSerializer(serializers.ModelSerializer):
+    """Accepts ``fields=[...]`` to serialize only the named fields."""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class CompanySummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Recruiter
+        fields = ['id', 'company_name']
+
+
+class RecruiterSerializer(SparseFieldsetSerializer):
+    class Meta:
+        model = Recruiter
+        fields = ['id', 'company_name', 'image']
+
+
+class VacancySerializer(SparseFieldsetSerializer):
+    company = CompanySummarySerializer(source='company_name', read_only=True)
+
+    class Meta:
+        model = Vacancy
+        fields = ['id', 'title', 'company', 'vacancy_type', 'tech_stack', 'salary', 'location', 'experience',
+                  'skills', 'description', 'company_logo', 'creation_date', 'start_date', 'end_date', 'updated_at']
+
+
+class ApplicationSerializer(SparseFieldsetSerializer):
+    vacancy_title = serializers.CharField(source='vacancy.title', read_only=True)
+    applicant_name = serializers.CharField(source='applicant.user.get_full_name', read_only=True)
+
+    class Meta:
+        model = Application
+        fields = ['id', 'vacancy', 'vacancy_title', 'company', 'applicant', 'applicant_name', 'resume',
+                  'application_date']
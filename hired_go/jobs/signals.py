@@ -0,0 +1,94 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import recommendations
+from .cache import bump_version
+from .dashboard import application_added, application_removed, vacancy_removed, vacancy_removing
+from .models import Application, JobSearcher, Recruiter, Vacancy, VacancyStatus
+from .profiles import forget
+from .ranking import mark_unscored
+from .search import get_backend
+from .skills import sync_skills
+
+
+@receiver(post_save, sender=Vacancy)
+def index_vacancy(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if not raw:
+        sync_skills([instance])
+        get_backend().index([instance.pk])
+        recommendations.matrix.index([instance.pk])
+    bump_version('vacancies')
+    # Closed vacancies have their own facet counts; an edit that may move the
+    # dates can take a vacancy in or out of that set.
+    dates_may_change = not created and (update_fields is None or {'start_date', 'end_date'} & set(update_fields))
+    if instance.status == VacancyStatus.closed.value or dates_may_change:
+        bump_version('closed_vacancies')
+
+
+@receiver(post_save, sender=Vacancy)
+def rescore_applications(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        mark_unscored(vacancy=instance)
+
+
+@receiver(post_delete, sender=Vacancy)
+def unindex_vacancy(sender, instance, **kwargs):
+    get_backend().remove([instance.pk])
+    recommendations.matrix.remove([instance.pk])
+    vacancy_removed(instance)
+    bump_version('vacancies')
+    if instance.status == VacancyStatus.closed.value:
+        bump_version('closed_vacancies')
+
+
+@receiver(pre_delete, sender=Vacancy)
+def uncount_vacancy(sender, instance, **kwargs):
+    vacancy_removing(instance)
+
+
+@receiver(post_save, sender=Recruiter)
+def touch_recruiter_vacancies(sender, instance, raw=False, **kwargs):
+    # Job detail pages show the company name, so their ETags must change too.
+    if not raw:
+        Vacancy.objects.filter(company_name=instance).update(updated_at=timezone.now())
+    bump_version('recruiters')
+
+
+@receiver(post_delete, sender=Recruiter)
+def invalidate_recruiter(sender, instance, **kwargs):
+    bump_version('recruiters')
+
+
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def invalidate_application(sender, instance, **kwargs):
+    bump_version('applicant:%s' % instance.applicant_id)
+
+
+@receiver(post_save, sender=Application)
+def count_application(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        application_added(instance)
+
+
+@receiver(post_delete, sender=Application)
+def uncount_application(sender, instance, **kwargs):
+    # Soft-deleted applications are reconciled by purge_deleted in bulk.
+    if instance.deleted_at is None:
+        application_removed(instance)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_user(sender, instance, **kwargs):
+    forget(instance.pk)
+
+
+@receiver(post_save, sender=JobSearcher)
+@receiver(post_delete, sender=JobSearcher)
+@receiver(post_save, sender=Recruiter)
+@receiver(post_delete, sender=Recruiter)
+def forget_profile(sender, instance, **kwargs):
+    forget(instance.user_id)
@@ -0,0 +1,66 @@
+import re
+
+from django.db.models import Q
+
+from .models import Skill, SkillAlias, VacancySkill
+
+
+SEPARATORS = re.compile(r'[,;|\n•]+')
+MAX_LENGTH = Skill._meta.get_field('slug').max_length
+
+
+def normalize(name):
+    return ' '.join((name or '').lower().split()).strip(' .')[:MAX_LENGTH]
+
+
+def split_skills(text):
+    """Skill names in free text such as 'Python, Django; PostgreSQL', in their original spelling."""
+    names = (' '.join(part.split()).strip(' .') for part in SEPARATORS.split(text or ''))
+    return [name[:MAX_LENGTH] for name in names if name]
+
+
+def resolve(names):
+    """
+    Map skill names to Skill ids as {slug: id}, following aliases and
+    creating skills that do not exist yet under the first spelling seen.
+    """
+    spellings = {}
+    for name in names:
+        spellings.setdefault(normalize(name), name)
+    spellings.pop('', None)
+    found = dict(SkillAlias.objects.filter(alias__in=spellings).values_list('alias', 'skill_id'))
+    found.update(Skill.objects.filter(slug__in=set(spellings) - set(found)).values_list('slug', 'id'))
+    missing = set(spellings) - set(found)
+    if missing:
+        Skill.objects.bulk_create([Skill(name=spellings[slug], slug=slug) for slug in missing],
+                                  ignore_conflicts=True)
+        found.update(Skill.objects.filter(slug__in=missing).values_list('slug', 'id'))
+    return found
+
+
+def sync_skills(vacancies):
+    """
+    Make the skill links of ``vacancies`` match their ``skills`` text, with
+    one lookup, one INSERT and at most one DELETE for the whole batch.
+    """
+    vacancies = list(vacancies)
+    if not vacancies:
+        return
+    parsed = {vacancy.pk: [normalize(name) for name in split_skills(vacancy.skills)] for vacancy in vacancies}
+    ids = resolve(name for vacancy in vacancies for name in split_skills(vacancy.skills))
+    wanted = {(pk, ids[slug]) for pk, slugs in parsed.items() for slug in slugs if slug in ids}
+    existing = {(vacancy_id, skill_id): pk for pk, vacancy_id, skill_id in
+                VacancySkill.objects.filter(vacancy_id__in=parsed).values_list('id', 'vacancy_id', 'skill_id')}
+    stale = [pk for link, pk in existing.items() if link not in wanted]
+    if stale:
+        VacancySkill.objects.filter(id__in=stale).delete()
+    VacancySkill.objects.bulk_create([VacancySkill(vacancy_id=vacancy_id, skill_id=skill_id)
+                                      for vacancy_id, skill_id in wanted - set(existing)], ignore_conflicts=True)
+
+
+def skill_q(slugs):
+    """Vacancies linked to any of the skills ``slugs`` (or their aliases), via the (skill, vacancy) index."""
+    slugs = [normalize(slug) for slug in slugs]
+    links = VacancySkill.objects.filter(Q(skill_id__in=Skill.objects.filter(slug__in=slugs).values('id'))
+                                        | Q(skill_id__in=SkillAlias.objects.filter(alias__in=slugs).values('skill_id')))
+    return Q(id__in=links.values('vacancy_id'))
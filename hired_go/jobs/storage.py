@@ -0,0 +1,96 @@
+import hashlib
+import mimetypes
+import os
+import posixpath
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponse
+from django.utils.http import http_date
+
+
+HASHED_NAME = re.compile(r'^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}(\.\w+)?$')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores each file as ``ab/cd/<sha256><ext>``. Identical uploads map to the
+    same name and are written once, and the two-level sharding keeps every
+    directory small however many files are stored. The requested name only
+    contributes its extension.
+
+    Because files may be shared by many rows, deleting a row must not delete
+    its file; ``delete()`` is therefore left to maintenance commands.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        return name
+
+    def hashed_name(self, digest, name):
+        extension = os.path.splitext(name)[1].lower()
+        return posixpath.join(digest[:2], digest[2:4], digest + extension)
+
+    def _digest(self, content):
+        sha256 = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks():
+            sha256.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return sha256.hexdigest()
+
+    def _save(self, name, content):
+        name = self.hashed_name(self._digest(content), name)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            return name
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        # Write next to the target and rename into place, so a concurrent
+        # upload of the same content never sees a partial file.
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            if hasattr(content, 'temporary_file_path'):
+                os.close(fd)
+                file_move_safe(content.temporary_file_path(), temp_path, allow_overwrite=True)
+            else:
+                with os.fdopen(fd, 'wb') as destination:
+                    for chunk in content.chunks():
+                        destination.write(chunk if isinstance(chunk, bytes) else chunk.encode())
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            os.replace(temp_path, full_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return name
+
+
+def sendfile_response(path, content_type=None, root=None):
+    """
+    Serve the file at ``path`` (inside ``root``, MEDIA_ROOT by default).
+
+    With SENDFILE_HEADER set, the response only carries the header (e.g.
+    ``X-Accel-Redirect`` for nginx, ``X-Sendfile`` for Apache) and the web
+    server streams the file itself. Otherwise a FileResponse is returned,
+    which WSGI servers hand to ``wsgi.file_wrapper``/``os.sendfile``.
+    """
+    root = root or settings.MEDIA_ROOT
+    if content_type is None:
+        content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+    header = getattr(settings, 'SENDFILE_HEADER', None)
+    if header:
+        response = HttpResponse(content_type=content_type)
+        if header.lower() == 'x-accel-redirect':
+            relative = os.path.relpath(path, root).replace(os.sep, '/')
+            response[header] = settings.SENDFILE_URL + relative
+        else:
+            response[header] = path
+    else:
+        response = FileResponse(open(path, 'rb'), content_type=content_type)
+    response['Last-Modified'] = http_date(os.path.getmtime(path))
+    return response
@@ -0,0 +1,12 @@
+from django import template
+
+from ..thumbnails import thumbnail_url
+
+
+register = template.Library()
+
+
+@register.simple_tag
+def thumbnail(field_file, size):
+    """URL of the ``size`` thumbnail of an image field, or '' if it is empty."""
+    return thumbnail_url(field_file.name if field_file else '', size)
@@ -1,3 +1,1155 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from io import BytesIO, StringIO
+import json
+import os
+from itertools import count
+import tempfile
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .cache import stats as cache_stats
+from .facets import facet_counts
+from .models import *
+from .search import get_backend
+
+
+_sequence = count()
+
+
+def make_recruiter(status="Accepted", **kwargs):
+    n = next(_sequence)
+    user = User.objects.create_user(username="company%d" % n, email="company%d@example.com" % n, password="secret",
+                                    first_name="Company", last_name=str(n))
+    fields = dict(image="logo.png", company_name="Company %d" % n)
+    fields.update(kwargs)
+    return Recruiter.objects.create(user=user, phone="5550000", gender="Male", type="company", status=status, **fields)
+
+
+def make_applicant(**kwargs):
+    n = next(_sequence)
+    user = User.objects.create_user(username="applicant%d@example.com" % n, password="secret",
+                                    first_name="Applicant", last_name=str(n))
+    return JobSearcher.objects.create(user=user, phone="5550000", gender="Female", type="applicant", **kwargs)
+
+
+def make_vacancy(company, **kwargs):
+    n = next(_sequence)
+    fields = dict(title="Vacancy %d" % n, company_name=company, salary=1000, company_logo="logo.png",
+                  description="Description", experience="2", location="Almaty", skills="Python, Django",
+                  start_date=date.today() - timedelta(days=n % 7), end_date=date.today() + timedelta(days=30))
+    fields.update(kwargs)
+    return Vacancy.objects.create(**fields)
+
+
+def make_application(vacancy, applicant, **kwargs):
+    fields = dict(vacancy=vacancy, company=vacancy.company_name, applicant=applicant, resume="resume.png",
+                  application_date=date.today())
+    fields.update(kwargs)
+    return Application.objects.create(**fields)
+
+
+class QueryBudgetMixin:
+    """
+    Asserts that a page issues the same number of queries however many rows
+    it lists, i.e. that related objects are fetched in bulk rather than per row.
+    """
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries)
+
+    def assertConstantQueries(self, url, add_rows, rounds=2):
+        add_rows()
+        baseline = self.count_queries(url)
+        for _ in range(rounds):
+            add_rows()
+            queries = self.count_queries(url)
+            self.assertEqual(queries, baseline, "%s issued %d queries, expected %d regardless of row count"
+                             % (url, queries, baseline))
+
+
+class ListQueryBudgetTests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        self.applicant = make_applicant()
+
+    def test_all_jobs(self):
+        self.client.force_login(self.applicant.user)
+        self.assertConstantQueries("/all_jobs/", lambda: [make_vacancy(make_recruiter()) for _ in range(3)])
+
+    def test_all_jobs_applied_state(self):
+        self.client.force_login(self.applicant.user)
+        self.assertConstantQueries("/all_jobs/", lambda: [make_application(make_vacancy(self.company), self.applicant)
+                                                          for _ in range(3)])
+        self.assertContains(self.client.get("/all_jobs/"), ">Applied<", count=9)
+
+    def test_all_applicants(self):
+        self.client.force_login(self.company.user)
+
+        def add_rows():
+            for _ in range(3):
+                make_application(make_vacancy(self.company), make_applicant())
+        self.assertConstantQueries("/all_applicants/", add_rows)
+
+    def test_job_list(self):
+        self.client.force_login(self.company.user)
+        self.assertConstantQueries("/job_list/", lambda: [make_vacancy(self.company) for _ in range(3)])
+
+    def test_view_applicants(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "secret"))
+        self.assertConstantQueries("/view_applicants/", lambda: [make_applicant() for _ in range(3)])
+
+    def test_company_lists(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "secret"))
+        for url, status in (("/all_companies/", "pending"), ("/pending_companies/", "pending"),
+                            ("/accepted_companies/", "Accepted"), ("/rejected_companies/", "Rejected")):
+            with self.subTest(url=url):
+                self.assertConstantQueries(url, lambda: [make_recruiter(status=status) for _ in range(3)])
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        company = make_recruiter()
+        today = date.today()
+        # Two pairs share a start_date, so the order between them comes from the id.
+        self.vacancies = [make_vacancy(company, start_date=today - timedelta(days=days)) for days in (0, 1, 1, 2, 2)]
+        self.expected = sorted(self.vacancies, key=lambda vacancy: (vacancy.start_date, vacancy.id), reverse=True)
+
+    def paginator(self):
+        from jobs.pagination import KeysetPaginator
+
+        return KeysetPaginator(Vacancy.objects.all(), 2)
+
+    def test_next_and_previous_cursors_walk_the_board(self):
+        paginator = self.paginator()
+        pages = [paginator.page()]
+        while pages[-1].has_next:
+            pages.append(paginator.page(after=pages[-1].next_cursor))
+        self.assertEqual([vacancy for page in pages for vacancy in page], self.expected)
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertFalse(pages[0].has_previous)
+
+        previous = paginator.page(before=pages[2].previous_cursor)
+        self.assertEqual(list(previous), list(pages[1]))
+        self.assertEqual(list(paginator.page(before=previous.previous_cursor)), list(pages[0]))
+        self.assertFalse(paginator.page(before=previous.previous_cursor).has_previous)
+
+    def test_ties_on_start_date_are_ordered_by_id(self):
+        paginator = self.paginator()
+        first = paginator.page()
+        second = paginator.page(after=first.next_cursor)
+        # The second page starts inside a pair of vacancies with the same start_date.
+        self.assertEqual(first.object_list[-1].start_date, second.object_list[0].start_date)
+        self.assertGreater(first.object_list[-1].id, second.object_list[0].id)
+        self.assertEqual(list(second), self.expected[2:4])
+
+    def test_invalid_cursor_shows_the_first_page(self):
+        paginator = self.paginator()
+        for cursor in ("not-a-cursor", "!!!", "MjAyNC0wMS0wMXw="):
+            with self.subTest(cursor=cursor):
+                self.assertEqual(list(paginator.page(after=cursor)), self.expected[:2])
+        self.client.force_login(make_applicant().user)
+        response = self.client.get("/all_jobs/", {'after': "not-a-cursor"})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.expected[0].title)
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        # PostgreSQL rightly prefers sequential scans on a few hundred rows, so it gets the full-size seed.
+        sizes = {} if connection.vendor == 'postgresql' else dict(companies=30, vacancies=300, applications=300)
+        call_command("explain_hot_queries", stdout=StringIO(), **sizes)
+
+
+class ApplicationCompanyMigrationTests(TransactionTestCase):
+    before = [('jobs', '0003_application_recruiter')]
+    after = [('jobs', '0005_application_company_fk')]
+
+    def migrate(self, targets=None):
+        from django.db.migrations.executor import MigrationExecutor
+
+        executor = MigrationExecutor(connection)
+        targets = targets or executor.loader.graph.leaf_nodes()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        self.migrate()
+
+    def test_usernames_are_backfilled_to_the_vacancy_recruiter_and_restored(self):
+        apps = self.migrate(self.before)
+        User = apps.get_model('auth', 'User')
+        Recruiter = apps.get_model('jobs', 'Recruiter')
+        JobSearcher = apps.get_model('jobs', 'JobSearcher')
+        Vacancy = apps.get_model('jobs', 'Vacancy')
+        Application = apps.get_model('jobs', 'Application')
+        recruiters = [Recruiter.objects.create(user=User.objects.create(username=name), phone='0', image='',
+                                               gender='', type='company', status='Accepted', company_name=name)
+                      for name in ('acme', 'globex')]
+        applicant = JobSearcher.objects.create(user=User.objects.create(username='applicant'), phone='0',
+                                               gender='', type='applicant')
+        expected = {}
+        for recruiter in recruiters:
+            vacancy = Vacancy.objects.create(title='Vacancy', company_name=recruiter, salary=0, company_logo='',
+                                             description='', experience='', location='', skills='',
+                                             start_date=date.today(), end_date=date.today())
+            application = Application.objects.create(company=recruiter.user.username, vacancy=vacancy,
+                                                     applicant=applicant, resume='', application_date=date.today())
+            expected[application.pk] = recruiter.pk
+        # A username changed after applying no longer matters: the recruiter comes from the vacancy.
+        User.objects.filter(pk=recruiters[0].user_id).update(username='acme-renamed')
+
+        apps = self.migrate(self.after)
+        Application = apps.get_model('jobs', 'Application')
+        self.assertEqual(dict(Application.objects.values_list('pk', 'company_id')), expected)
+
+        apps = self.migrate(self.before)
+        Application = apps.get_model('jobs', 'Application')
+        self.assertEqual(sorted(Application.objects.values_list('company', flat=True)), ['acme-renamed', 'globex'])
+
+
+class ApplicationCompanyTests(TestCase):
+    def test_applicants_page_survives_a_username_change(self):
+        company = make_recruiter()
+        application = make_application(make_vacancy(company), make_applicant())
+        User.objects.filter(pk=company.user_id).update(username="renamed-company")
+        self.client.force_login(company.user)
+        response = self.client.get("/all_applicants/")
+        self.assertEqual([row.pk for row in response.context["application"]], [application.pk])
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        company = make_recruiter()
+        self.django = make_vacancy(company, title="Django Developer", skills="Python, Django")
+        self.python = make_vacancy(company, title="Data Engineer", skills="Python, Airflow")
+        self.swift = make_vacancy(company, title="iOS Developer", skills="Swift", tech_stack="Swift")
+        get_backend().rebuild()
+        self.client.force_login(make_applicant().user)
+
+    def search(self, query):
+        return [vacancy.id for vacancy in self.client.get("/search/", {'q': query}).context['vacancies']]
+
+    def test_title_match_ranks_first(self):
+        mention = make_vacancy(self.django.company_name, title="Backend Developer", skills="Go", description="Some Django work",
+                               start_date=self.django.start_date + timedelta(days=1))
+        get_backend().rebuild()
+        self.assertEqual(self.search("django"), [self.django.id, mention.id])
+        self.assertEqual(self.search("django python"), [self.django.id])
+        self.assertEqual(set(self.search("python")), {self.django.id, self.python.id})
+
+    def test_index_follows_saves_and_deletes(self):
+        self.swift.title = "Senior Kotlin Developer"
+        self.swift.save()
+        self.assertEqual(self.search("kotlin"), [self.swift.id])
+        self.swift.delete()
+        self.assertEqual(self.search("kotlin"), [])
+
+    def test_queryset_results_are_evaluated_off_the_event_loop(self):
+        from unittest import mock
+
+        ids = Vacancy.objects.filter(skills__icontains="python").order_by('id').values_list('id', flat=True)
+        with mock.patch.object(get_backend(), "search", return_value=ids):
+            self.assertEqual(self.search("python"), [self.django.id, self.python.id])
+
+
+class FacetTests(TestCase):
+    def setUp(self):
+        company = make_recruiter()
+        make_vacancy(company, tech_stack="Python", vacancy_type="Remote", salary=2000)
+        make_vacancy(company, tech_stack="Python", vacancy_type="Office", salary=4000)
+        make_vacancy(company, tech_stack="Go", vacancy_type="Remote", salary=4000,
+                     end_date=date.today() - timedelta(days=1))
+
+    def counts(self, selected):
+        return {facet['name']: {option['value']: option['count'] for option in facet['options']}
+                for facet in facet_counts(selected)}
+
+    def test_counts_exclude_own_selection(self):
+        counts = self.counts({'tech_stack': ['Python']})
+        self.assertEqual(counts['tech_stack'], {'Python': 2, 'Go': 1})
+        self.assertEqual(counts['vacancy_type'], {'Remote': 1, 'Office': 1})
+        self.assertEqual(counts['availability'], {'open': 2})
+
+    def test_counts_are_cached_until_a_vacancy_changes(self):
+        self.counts({})
+        with self.assertNumQueries(0):
+            self.assertEqual(self.counts({'salary_range': ['3000-5000']})['tech_stack'], {'Python': 1, 'Go': 1})
+        make_vacancy(make_recruiter(), tech_stack="Go", salary=3500)
+        # The grouped facet rows and the skill counts.
+        with self.assertNumQueries(2):
+            self.assertEqual(self.counts({'salary_range': ['3000-5000']})['tech_stack'], {'Python': 1, 'Go': 2})
+
+    def test_closed_counts_follow_closing_and_reopening(self):
+        self.assertEqual(self.counts({})['availability'], {'open': 2, 'closed': 1})
+        closed = Vacancy.objects.get(status="closed")
+        closed.end_date = date.today() + timedelta(days=3)
+        closed.save()
+        self.assertEqual(self.counts({})['availability'], {'open': 3})
+        Vacancy.objects.filter(pk=closed.pk).update(end_date=date.today() - timedelta(days=1))
+        call_command("sweep_vacancies", stdout=StringIO())
+        self.assertEqual(self.counts({})['availability'], {'open': 2, 'closed': 1})
+
+    def test_job_board_filters(self):
+        self.client.force_login(make_applicant().user)
+        response = self.client.get("/all_jobs/", {'tech_stack': 'Python', 'availability': 'open'})
+        self.assertEqual(len(response.context['vacancies']), 2)
+        response = self.client.get("/all_jobs/", {'salary_range': '3000-5000', 'vacancy_type': 'Remote'})
+        self.assertEqual(len(response.context['vacancies']), 0)
+        response = self.client.get("/all_jobs/", {'salary_range': '3000-5000', 'availability': ['open', 'closed']})
+        self.assertEqual(len(response.context['vacancies']), 2)
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        self.vacancy = make_vacancy(self.company, title="Python Developer")
+        self.applicant = make_applicant()
+        self.client.force_login(self.applicant.user)
+
+    def hits(self, name):
+        return cache_stats()[name]['hits']
+
+    def test_job_detail_is_cached_until_the_vacancy_changes(self):
+        url = "/job_detail/%d/" % self.vacancy.pk
+        self.client.get(url)
+        hits = self.hits('job_detail')
+        with self.assertNumQueries(3):
+            self.assertContains(self.client.get(url), "Python Developer")
+        self.assertEqual(self.hits('job_detail'), hits + 1)
+        self.vacancy.title = "Go Developer"
+        self.vacancy.save()
+        self.assertContains(self.client.get(url), "Go Developer")
+        self.company.company_name = "Renamed Ltd"
+        self.company.save()
+        self.assertContains(self.client.get(url), "Renamed Ltd")
+
+    def test_job_board_fragment_follows_applications(self):
+        self.client.get("/all_jobs/")
+        self.assertNotContains(self.client.get("/all_jobs/"), ">Applied<")
+        make_application(self.vacancy, self.applicant)
+        self.assertContains(self.client.get("/all_jobs/"), ">Applied<")
+
+
+class ConditionalJobDetailTests(TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        self.vacancy = make_vacancy(self.company)
+        self.url = "/job_detail/%d/" % self.vacancy.pk
+
+    def test_missing_vacancy_is_404(self):
+        self.assertEqual(self.client.get("/job_detail/0/").status_code, 404)
+
+    def test_revalidation(self):
+        response = self.client.get(self.url)
+        self.assertIn("public", response["Cache-Control"])
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        self.company.company_name = "Renamed Ltd"
+        self.company.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertContains(response, "Renamed Ltd")
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_logged_in_pages_are_private(self):
+        self.client.force_login(make_applicant().user)
+        self.assertIn("private", self.client.get(self.url)["Cache-Control"])
+
+
+class APITests(QueryBudgetMixin, TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        self.vacancies = [make_vacancy(self.company) for _ in range(5)]
+
+    def test_vacancy_cursor_pagination(self):
+        ids, url = [], "/api/vacancies/?page_size=2"
+        while url:
+            data = self.client.get(url).json()
+            ids += [vacancy["id"] for vacancy in data["results"]]
+            url = data["next"]
+        expected = sorted(self.vacancies, key=lambda vacancy: (vacancy.start_date, vacancy.id), reverse=True)
+        self.assertEqual(ids, [vacancy.id for vacancy in expected])
+
+    def test_sparse_fieldsets(self):
+        data = self.client.get("/api/vacancies/", {'fields': 'id,title'}).json()
+        self.assertEqual(set(data["results"][0]), {"id", "title"})
+
+    def test_vacancy_list_query_budget(self):
+        self.assertConstantQueries("/api/vacancies/", lambda: [make_vacancy(make_recruiter()) for _ in range(3)])
+
+    def test_applications_are_scoped_to_the_recruiter(self):
+        make_application(self.vacancies[0], make_applicant())
+        make_application(make_vacancy(make_recruiter()), make_applicant())
+        self.assertEqual(self.client.get("/api/applications/").status_code, 403)
+        self.client.force_login(self.company.user)
+        self.assertEqual(len(self.client.get("/api/applications/").json()["results"]), 1)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        vacancy = make_vacancy(self.company)
+        self.applications = [make_application(vacancy, make_applicant()) for _ in range(3)]
+        make_application(make_vacancy(make_recruiter()), make_applicant())
+
+    def test_recruiter_csv_export_streams_own_applications(self):
+        self.client.force_login(self.company.user)
+        response = self.client.get("/export/applications/")
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[:3], ["id", "vacancy_id", "vacancy_title"])
+        self.assertEqual([int(line.split(",")[0]) for line in lines[1:]], [a.id for a in self.applications])
+
+    def test_admin_ndjson_export(self):
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "secret"))
+        response = self.client.get("/export/applicants/", {'format': 'ndjson'})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), JobSearcher.objects.count())
+        self.assertEqual(self.client.get("/export/applicants/", {'format': 'xml'}).status_code, 400)
+
+    async def test_exports_run_under_asgi(self):
+        admin = await sync_to_async(User.objects.create_superuser)("admin", "admin@example.com", "secret")
+        await sync_to_async(self.async_client.force_login)(admin)
+        response = await self.async_client.get("/export/applicants/", {'format': 'ndjson'})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), await JobSearcher.objects.acount())
+        self.assertIn('filename="applicants.ndjson"', response["Content-Disposition"])
+
+
+class VacancyImportTests(TestCase):
+    header = "title,vacancy_type,tech_stack,salary,experience,location,skills,description,start_date,end_date\n"
+    row = "Backend Developer,Remote,Python,2500,3,Almaty,Django,Build APIs,2023-01-01,2023-02-01\n"
+
+    def setUp(self):
+        self.company = make_recruiter()
+        self.client.force_login(self.company.user)
+
+    def upload(self, content, name="jobs.csv", **data):
+        data['file'] = SimpleUploadedFile(name, content.encode())
+        return self.client.post("/import_jobs/", data)
+
+    def test_csv_upload_reports_row_errors(self):
+        response = self.upload(self.header + self.row * 3 + self.row.replace("Python", "Cobol"))
+        self.assertEqual(response.context['result'].created, 3)
+        self.assertEqual(response.context['errors'][0][0], 4)
+        self.assertIn("tech_stack", response.context['errors'][0][1])
+        self.assertEqual(Vacancy.objects.filter(company_name=self.company, company_logo="logo.png").count(), 3)
+
+    def test_strict_import_rolls_back(self):
+        self.upload(self.header + self.row + self.row.replace("2500", "lots"), strict="1")
+        self.assertFalse(Vacancy.objects.exists())
+
+    def test_json_upload(self):
+        rows = [dict(zip(self.header.strip().split(","), self.row.strip().split(",")))] * 2
+        response = self.upload(json.dumps(rows), name="jobs.json")
+        self.assertEqual(response.context['result'].created, 2)
+
+
+def make_image(name="upload.png", size=(40, 30)):
+    from PIL import Image
+
+    buffer = BytesIO()
+    Image.new("RGB", size, "red").save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+@override_settings(UPLOAD_WORKERS=0, UPLOAD_MAX_DIMENSION=20)
+class UploadPipelineTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name, UPLOAD_STAGING_DIR=media.name + "/staging")
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.applicant = make_applicant()
+        self.vacancy = make_vacancy(make_recruiter())
+        self.client.force_login(self.applicant.user)
+
+    def test_resume_is_normalised_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.client.post("/job_apply/%d/" % self.vacancy.pk, {'resume': make_image()})
+        self.assertEqual(len(callbacks), 1)
+        application = Application.objects.get(applicant=self.applicant)
+        self.assertEqual(application.upload_status, UploadStatus.ready.value)
+        self.assertEqual((application.resume.width, application.resume.height), (20, 15))
+
+    def test_small_png_is_stored_unchanged(self):
+        upload = make_image(size=(16, 12))
+        content = upload.read()
+        upload.seek(0)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/job_apply/%d/" % self.vacancy.pk, {'resume': upload})
+        application = Application.objects.get(applicant=self.applicant)
+        self.assertTrue(application.resume.name.endswith(".png"))
+        with application.resume.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+
+    def test_invalid_image_is_marked_failed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/user_homepage/", {'email': "a@example.com", 'first_name': "A", 'last_name': "B",
+                                                 'phone': "5550000", 'gender': "Female",
+                                                 'image': SimpleUploadedFile("photo.png", b"not an image")})
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.upload_status, UploadStatus.failed.value)
+        self.assertFalse(self.applicant.image)
+
+    def test_uploads_left_pending_by_a_stopped_process_are_recovered(self):
+        from jobs.uploads import staging_dir
+
+        # Without captureOnCommitCallbacks the on_commit submit never runs, as if the process had died.
+        self.client.post("/user_homepage/", {'email': "a@example.com", 'first_name': "A", 'last_name': "B",
+                                             'phone': "5550000", 'gender': "Female", 'image': make_image()})
+        stalled = make_applicant(upload_status=UploadStatus.pending.value)
+        orphan = os.path.join(staging_dir(), "leftover.png")
+        open(orphan, "wb").close()
+        for name in os.listdir(staging_dir()):
+            os.utime(os.path.join(staging_dir(), name), (0, 0))
+
+        out = StringIO()
+        call_command("recover_uploads", stdout=out)
+        self.assertIn("Processed 1 staged uploads, removed 1 orphaned files, marked 1 uploads as failed",
+                      out.getvalue())
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.upload_status, UploadStatus.ready.value)
+        self.assertTrue(self.applicant.image)
+        stalled.refresh_from_db()
+        self.assertEqual(stalled.upload_status, UploadStatus.failed.value)
+        self.assertEqual(os.listdir(staging_dir()), [])
+
+    def test_new_logo_changes_the_job_detail_etag(self):
+        company = self.vacancy.company_name
+        url = "/job_detail/%d/" % self.vacancy.pk
+        etag = self.client.get(url)["ETag"]
+        self.client.force_login(company.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/company_logo/%d/" % self.vacancy.pk, {'logo': make_image()})
+        self.vacancy.refresh_from_db()
+        self.assertNotEqual(self.vacancy.company_logo.name, "logo.png")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+
+class AsyncViewTests(TestCase):
+    def setUp(self):
+        self.applicant = make_applicant()
+        self.vacancy = make_vacancy(make_recruiter())
+
+    async def test_read_pages_render_from_the_event_loop(self):
+        response = await self.async_client.get("/job_detail/%d/" % self.vacancy.pk)
+        self.assertContains(response, self.vacancy.title)
+        response = await self.async_client.get("/all_jobs/")
+        self.assertEqual(response.status_code, 302)
+
+        await sync_to_async(self.async_client.force_login)(self.applicant.user)
+        for url in ("/all_jobs/", "/search/?q=Vacancy", "/"):
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+
+class ThumbnailTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        from django.core.files.storage import default_storage
+        self.name = default_storage.save("photo.png", make_image(size=(900, 700)))
+        make_recruiter(image=self.name)
+
+    def test_thumbnail_is_rendered_once_and_cached(self):
+        from PIL import Image
+
+        url = "/thumbs/small/%s" % self.name
+        response = self.client.get(url, HTTP_ACCEPT="image/webp,*/*")
+        self.assertEqual(response['Content-Type'], "image/webp")
+        self.assertIn("immutable", response['Cache-Control'])
+        self.assertIn("Accept", response['Vary'])
+        self.assertEqual(Image.open(BytesIO(b"".join(response.streaming_content))).size, (90, 70))
+        response = self.client.get(url)
+        self.assertEqual(response['Content-Type'], "image/jpeg")
+
+    def test_unknown_size_or_file_is_404(self):
+        self.assertEqual(self.client.get("/thumbs/huge/%s" % self.name).status_code, 404)
+        self.assertEqual(self.client.get("/thumbs/small/missing.png").status_code, 404)
+        self.assertEqual(self.client.get("/thumbs/small/../../settings.py").status_code, 404)
+
+    @override_settings(UPLOAD_WORKERS=0)
+    def test_resumes_get_no_thumbnails(self):
+        from jobs.thumbnails import derived_storage
+
+        applicant = make_applicant()
+        self.client.force_login(applicant.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post("/job_apply/%d/" % make_vacancy(make_recruiter()).pk, {'resume': make_image()})
+        resume = Application.objects.get(applicant=applicant).resume.name
+        self.assertFalse(derived_storage.exists("thumbs"))
+        self.assertEqual(self.client.get("/thumbs/small/%s" % resume).status_code, 404)
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings_override = override_settings(MEDIA_ROOT=media.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_identical_uploads_share_one_file(self):
+        from django.core.files.storage import default_storage
+
+        first = default_storage.save("a.PNG", SimpleUploadedFile("a.PNG", b"same bytes"))
+        second = default_storage.save("b.png", SimpleUploadedFile("b.png", b"same bytes"))
+        self.assertEqual(first, second)
+        self.assertRegex(first, r"^[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$")
+        self.assertEqual(len(os.listdir(os.path.dirname(default_storage.path(first)))), 1)
+
+        make_recruiter(image=first)
+        response = self.client.get("/media/" + first)
+        self.assertEqual(b"".join(response.streaming_content), b"same bytes")
+        self.assertIn("immutable", response['Cache-Control'])
+        self.assertEqual(self.client.get("/media/../settings.py").status_code, 404)
+
+    def test_unchanged_media_answers_304(self):
+        from django.core.files.storage import default_storage
+
+        name = default_storage.save("logo.png", SimpleUploadedFile("logo.png", b"logo"))
+        make_recruiter(image=name)
+        last_modified = self.client.get("/media/" + name)["Last-Modified"]
+        response = self.client.get("/media/" + name, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+
+    def test_resumes_are_only_served_to_the_applicant_and_company(self):
+        from django.core.files.storage import default_storage
+
+        name = default_storage.save("resume.png", SimpleUploadedFile("resume.png", b"resume"))
+        application = make_application(make_vacancy(make_recruiter()), make_applicant(), resume=name)
+        self.assertEqual(self.client.get("/media/" + name).status_code, 404)
+        self.client.force_login(make_applicant().user)
+        self.assertEqual(self.client.get("/media/" + name).status_code, 404)
+        for user in (application.applicant.user, application.company.user):
+            self.client.force_login(user)
+            response = self.client.get("/media/" + name)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("private", response["Cache-Control"])
+
+    def test_dedupe_media_rewrites_legacy_names(self):
+        from django.core.files.storage import FileSystemStorage
+
+        FileSystemStorage().save("logo.png", SimpleUploadedFile("logo.png", b"legacy logo"))
+        company = make_recruiter()
+        vacancies = [make_vacancy(company) for _ in range(3)]
+        call_command("dedupe_media", "--delete-originals", stdout=StringIO())
+        company.refresh_from_db()
+        self.assertRegex(company.image.name, r"^[0-9a-f]{2}/")
+        self.assertEqual({v.company_logo.name for v in Vacancy.objects.filter(pk__in=[v.pk for v in vacancies])},
+                         {company.image.name})
+        self.assertEqual(company.image.read(), b"legacy logo")
+
+
+class DashboardStatsTests(TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        today = date.today()
+        self.open = make_vacancy(self.company, end_date=today + timedelta(days=5))
+        self.closed = make_vacancy(self.company, end_date=today - timedelta(days=1))
+        self.upcoming = make_vacancy(self.company, start_date=today + timedelta(days=1))
+        self.applications = [make_application(self.open, make_applicant(), application_date=today - timedelta(days=i))
+                             for i in range(3)]
+
+    def test_summary_tables_follow_application_writes(self):
+        stats = VacancyStats.objects.get(vacancy=self.open)
+        self.assertEqual((stats.applications, stats.first_application_date),
+                         (3, date.today() - timedelta(days=2)))
+        self.applications[-1].delete()
+        stats.refresh_from_db()
+        self.assertEqual((stats.applications, stats.first_application_date),
+                         (2, date.today() - timedelta(days=1)))
+        self.assertEqual(DailyApplicationStats.objects.get(day=date.today() - timedelta(days=2)).applications, 0)
+
+    def test_deleting_a_vacancy_settles_counts_once(self):
+        make_application(self.closed, make_applicant())
+        with CaptureQueriesContext(connection) as queries:
+            self.open.delete()
+        aggregates = [query for query in queries if 'MIN(' in query['sql'].upper()]
+        self.assertEqual(aggregates, [])
+        self.assertFalse(VacancyStats.objects.filter(vacancy_id=self.applications[0].vacancy_id).exists())
+        self.assertEqual(sum(DailyApplicationStats.objects.values_list('applications', flat=True)), 1)
+        self.assertEqual(VacancyStats.objects.get(vacancy=self.closed).applications, 1)
+
+    def test_rebuild_matches_incremental_updates(self):
+        expected = sorted(VacancyStats.objects.values_list('vacancy', 'applications', 'first_application_date'))
+        VacancyStats.objects.all().delete()
+        call_command("rebuild_dashboard_stats", stdout=StringIO())
+        self.assertEqual(sorted(VacancyStats.objects.values_list('vacancy', 'applications',
+                                                                 'first_application_date')), expected)
+
+    def test_dashboard_queries_do_not_grow_with_applications(self):
+        self.client.force_login(self.company.user)
+        with self.assertNumQueries(5):
+            response = self.client.get("/company_homepage/")
+        dashboard = response.context['dashboard']
+        self.assertEqual((dashboard['applications'], dashboard['open_vacancies'], dashboard['closed_vacancies']),
+                         (3, 1, 1))
+        make_application(self.closed, make_applicant())
+        with self.assertNumQueries(5):
+            self.client.get("/company_homepage/")
+
+
+class ModerationQueueTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "secret")
+        self.client.force_login(self.admin)
+        self.pending = [make_recruiter(status="pending") for _ in range(30)]
+
+    def test_queue_is_paginated(self):
+        response = self.client.get("/pending_companies/", {'page_size': 10, 'page': 2})
+        self.assertEqual([c.pk for c in response.context['companies']], [c.pk for c in self.pending[10:20]])
+
+    def test_bulk_accept_runs_one_update_and_one_insert(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post("/moderate_companies/", {'scope': 'all', 'status': 'Accepted'})
+        self.assertRedirects(response, "/pending_companies/", fetch_redirect_response=False)
+        writes = [q['sql'] for q in context.captured_queries if q['sql'].startswith(("UPDATE", "INSERT"))]
+        self.assertEqual([sql.split()[0] for sql in writes if "jobs_" in sql], ["UPDATE", "INSERT"])
+        self.assertFalse(Recruiter.objects.filter(status="pending").exists())
+        self.assertEqual(ModerationEvent.objects.filter(moderator=self.admin, previous_status="pending",
+                                                        status="Accepted").count(), 30)
+
+    def test_selected_companies_and_validation(self):
+        chosen = [self.pending[0].pk, self.pending[1].pk]
+        self.client.post("/moderate_companies/", {'company': chosen, 'status': 'Rejected'})
+        self.assertEqual(set(Recruiter.objects.filter(status="Rejected").values_list('pk', flat=True)), set(chosen))
+        response = self.client.post("/moderate_companies/", {'company': chosen, 'status': 'Deleted'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_change_status_is_for_superusers_and_shows_the_new_status(self):
+        company = self.pending[0]
+        self.client.force_login(make_applicant().user)
+        self.assertEqual(self.client.post("/change_status/%d/" % company.pk, {'status': 'Accepted'}).status_code, 403)
+        company.refresh_from_db()
+        self.assertEqual(company.status, "pending")
+        self.client.force_login(self.admin)
+        response = self.client.post("/change_status/%d/" % company.pk, {'status': 'Accepted'})
+        self.assertEqual(response.context['company'].status, "Accepted")
+
+
+class VacancyStatusTests(TestCase):
+    def test_status_is_set_on_save_and_swept_as_dates_pass(self):
+        company = make_recruiter()
+        today = date.today()
+        live = make_vacancy(company, start_date=today - timedelta(days=10), end_date=today)
+        upcoming = make_vacancy(company, start_date=today + timedelta(days=2), end_date=today + timedelta(days=9))
+        self.assertEqual((live.status, upcoming.status), ("open", "upcoming"))
+
+        Vacancy.objects.filter(pk=live.pk).update(end_date=today - timedelta(days=1))
+        Vacancy.objects.filter(pk=upcoming.pk).update(start_date=today)
+        out = StringIO()
+        call_command("sweep_vacancies", "--batch-size", "1", stdout=out)
+        self.assertIn("2 vacancies", out.getvalue())
+        self.assertEqual(dict(Vacancy.objects.values_list('pk', 'status')), {live.pk: "closed", upcoming.pk: "open"})
+
+    def test_job_board_defaults_to_open_vacancies(self):
+        company = make_recruiter()
+        make_vacancy(company, title="Still hiring")
+        make_vacancy(company, title="Long gone", end_date=date.today() - timedelta(days=30))
+        self.client.force_login(make_applicant().user)
+        response = self.client.get("/all_jobs/")
+        self.assertContains(response, "Still hiring")
+        self.assertNotContains(response, "Long gone")
+        self.assertContains(self.client.get("/all_jobs/", {'availability': 'closed'}), "Long gone")
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser("admin", "admin@example.com", "secret")
+        self.client.force_login(self.admin)
+        self.company = make_recruiter()
+        self.other = make_recruiter()
+        self.applicant = make_applicant()
+        self.vacancies = [make_vacancy(self.company) for _ in range(3)]
+        for vacancy in self.vacancies:
+            make_application(vacancy, self.applicant)
+        make_application(make_vacancy(self.other), self.applicant)
+
+    def test_deleting_a_company_hides_it_and_purge_removes_it_in_batches(self):
+        self.assertEqual(self.client.get("/delete_company/%d/" % self.company.pk).status_code, 405)
+        self.assertRedirects(self.client.post("/delete_company/%d/" % self.company.pk), "/all_companies/",
+                             fetch_redirect_response=False)
+        self.assertFalse(Recruiter.objects.filter(pk=self.company.pk).exists())
+        self.assertEqual(Vacancy.objects.count(), 1)
+        self.assertEqual(Application.objects.count(), 1)
+        self.assertFalse(User.objects.get(pk=self.company.user_id).is_active)
+
+        call_command("purge_deleted", "--batch-size", "2", "--skip-media", stdout=StringIO())
+        self.assertFalse(Recruiter.all_objects.filter(pk=self.company.pk).exists())
+        self.assertFalse(User.objects.filter(pk=self.company.user_id).exists())
+        self.assertEqual(Vacancy.all_objects.count(), 1)
+        self.assertEqual(Application.all_objects.count(), 1)
+
+    def test_deleting_an_applicant_updates_dashboards_on_purge(self):
+        self.assertEqual(self.client.get("/delete_applicant/%d/" % self.applicant.pk).status_code, 405)
+        self.assertTrue(JobSearcher.objects.filter(pk=self.applicant.pk).exists())
+        self.client.post("/delete_applicant/%d/" % self.applicant.pk)
+        self.assertFalse(JobSearcher.objects.filter(pk=self.applicant.pk).exists())
+        self.assertFalse(Application.objects.exists())
+
+        call_command("purge_deleted", "--skip-media", stdout=StringIO())
+        self.assertFalse(Application.all_objects.exists())
+        self.assertFalse(User.objects.filter(pk=self.applicant.user_id).exists())
+        self.assertFalse(VacancyStats.objects.exists())
+
+    def test_orphaned_media_is_removed(self):
+        from django.core.files.storage import default_storage
+        from jobs.deletion import purge_orphaned_media
+
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        with override_settings(MEDIA_ROOT=media.name):
+            kept = default_storage.save("kept.png", SimpleUploadedFile("kept.png", b"kept"))
+            orphan = default_storage.save("orphan.png", SimpleUploadedFile("orphan.png", b"orphan"))
+            Recruiter.objects.filter(pk=self.other.pk).update(image=kept)
+            self.assertEqual(purge_orphaned_media(min_age=0), [orphan])
+            self.assertTrue(default_storage.exists(kept))
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        from jobs import recommendations
+
+        recommendations.matrix.reset()
+        self.addCleanup(recommendations.matrix.reset)
+        self.company = make_recruiter()
+        self.applicant = make_applicant()
+        self.applied = make_vacancy(self.company, title="Backend Developer", skills="Python, Django, Postgres")
+        make_application(self.applied, self.applicant)
+        self.similar = make_vacancy(self.company, title="Python Developer", skills="Python, Django")
+        self.partial = make_vacancy(self.company, title="Data Engineer", skills="Python, Spark")
+        self.unrelated = make_vacancy(self.company, title="Accountant", skills="Excel",
+                                      tech_stack=TechStack.PHP.value)
+        self.closed = make_vacancy(self.company, title="Backend Developer", skills="Python, Django, Postgres",
+                                   end_date=date.today() - timedelta(days=1))
+
+    def test_recommends_similar_open_vacancies_not_applied_to(self):
+        from jobs.recommendations import recommend
+
+        self.assertEqual(recommend(self.applicant), [self.similar, self.partial])
+
+    def test_pure_python_fallback_gives_the_same_order(self):
+        from unittest import mock
+        from jobs import recommendations
+
+        with mock.patch.object(recommendations, "numpy", None):
+            self.assertEqual(recommendations.recommend(self.applicant), [self.similar, self.partial])
+
+    def test_results_are_cached_until_the_applicant_applies_again(self):
+        from jobs.recommendations import recommend
+
+        recommend(self.applicant)
+        with CaptureQueriesContext(connection) as queries:
+            recommend(self.applicant)
+        self.assertEqual(len(queries), 1)
+
+        make_application(self.similar, self.applicant)
+        self.assertEqual(recommend(self.applicant), [self.partial])
+
+    def test_new_vacancies_are_indexed_on_save(self):
+        from jobs.recommendations import recommend
+
+        recommend(self.applicant)
+        newest = make_vacancy(self.company, title="Backend Developer", skills="Python, Django, Postgres")
+        self.assertEqual(recommend(self.applicant)[0], newest)
+
+    def test_stale_matrix_is_rebuilt_in_the_background(self):
+        from unittest import mock
+        from jobs import recommendations
+
+        recommendations.recommend(self.applicant)
+        recommendations.matrix.built_at -= 7200
+        newest = make_vacancy(self.company, title="Backend Developer", skills="Python, Django, Postgres")
+        with mock.patch.object(recommendations.matrix, "rebuild_later") as rebuild_later:
+            self.assertEqual(recommendations.recommend(self.applicant)[0], newest)
+        rebuild_later.assert_called_once_with()
+
+    def test_sweeper_indexes_vacancies_that_open(self):
+        from jobs.recommendations import recommend
+
+        upcoming = make_vacancy(self.company, title="Python Developer", skills="Python, Django, Postgres",
+                                start_date=date.today() + timedelta(days=1))
+        recommend(self.applicant)
+        Vacancy.objects.filter(pk=upcoming.pk).update(start_date=date.today())
+        call_command("sweep_vacancies", stdout=StringIO())
+        self.assertEqual(recommend(self.applicant)[0], upcoming)
+
+    def test_changes_from_other_processes_are_picked_up(self):
+        from unittest import mock
+        from jobs import recommendations
+
+        recommendations.recommend(self.applicant)
+        # Another worker saves the vacancy: its signals index that worker's matrix, not this one.
+        self.unrelated.skills = "Python, Django, Postgres"
+        self.unrelated.tech_stack = TechStack.OTHER.value
+        with mock.patch.object(recommendations.matrix, "index"):
+            self.unrelated.save()
+        self.assertEqual(recommendations.recommend(self.applicant)[0], self.unrelated)
+
+    def test_imported_vacancies_are_recommended(self):
+        from jobs.imports import import_vacancies
+        from jobs.recommendations import recommend
+
+        recommend(self.applicant)
+        row = dict(title="Django Developer", vacancy_type="Remote", tech_stack="Python", salary="2500",
+                   experience="3", location="Almaty", skills="Python, Django, Postgres", description="APIs",
+                   start_date=str(date.today()), end_date=str(date.today() + timedelta(days=30)))
+        import_vacancies(self.company, [row])
+        self.assertIn("Django Developer", [vacancy.title for vacancy in recommend(self.applicant)])
+
+    def test_homepage_lists_recommendations(self):
+        self.client.force_login(self.applicant.user)
+        response = self.client.get("/user_homepage/")
+        self.assertEqual(list(response.context["recommendations"]), [self.similar, self.partial])
+
+
+class ApplicantRankingTests(TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        self.vacancy = make_vacancy(self.company, skills="Python, Django", experience="3")
+        self.strong = make_applicant(skills="Django, Python, Docker", experience=5)
+        self.weak = make_applicant(skills="Java", experience=1)
+        self.older = make_applicant(skills="Python, Django", experience=3)
+        for applicant in (self.weak, self.strong):
+            make_application(self.vacancy, applicant)
+        make_application(self.vacancy, self.older, application_date=date.today() - timedelta(days=14))
+
+    def test_scores_are_stored_in_batches(self):
+        from jobs.ranking import score_applications
+
+        self.assertEqual(score_applications(batch_size=2), 3)
+        scores = dict(Application.objects.values_list('applicant', 'score'))
+        self.assertEqual(scores[self.strong.pk], 1.0)
+        self.assertEqual(scores[self.older.pk], 0.925)
+        self.assertAlmostEqual(scores[self.weak.pk], 0.2333, places=4)
+        self.assertEqual(score_applications(), 0)
+        self.assertEqual(score_applications(rescore_after=0), 3)
+
+    def test_applicants_are_listed_best_match_first_with_cursors(self):
+        call_command("score_applications", stdout=StringIO())
+        self.client.force_login(self.company.user)
+        response = self.client.get("/all_applicants/", {"page_size": 2, "vacancy": self.vacancy.pk})
+        self.assertEqual([a.applicant for a in response.context["application"]], [self.strong, self.older])
+        response = self.client.get("/all_applicants/", {"page_size": 2, "after": response.context["page"].next_cursor})
+        self.assertEqual([a.applicant for a in response.context["application"]], [self.weak])
+
+    def test_changes_to_the_vacancy_or_profile_queue_a_rescore(self):
+        from jobs.ranking import score_applications
+
+        score_applications()
+        self.vacancy.skills = "Java"
+        self.vacancy.save()
+        self.assertFalse(Application.objects.exclude(scored_at=None).exists())
+        score_applications()
+
+        self.client.force_login(self.weak.user)
+        self.client.post("/user_homepage/", {"email": "weak@example.com", "first_name": "Weak", "last_name": "One",
+                                             "phone": "5550000", "gender": "Female", "skills": "Java",
+                                             "experience": "4"})
+        self.assertEqual(list(Application.objects.filter(scored_at=None).values_list('applicant', flat=True)),
+                         [self.weak.pk])
+        score_applications()
+        self.assertEqual(Application.objects.get(applicant=self.weak).score, 1.0)
+
+
+class SkillTaxonomyTests(TestCase):
+    def setUp(self):
+        self.company = make_recruiter()
+        self.django = make_vacancy(self.company, skills="Django; python3, K8s")
+        self.node = make_vacancy(self.company, skills="node.js, JS, PostgreSQL")
+        self.closed = make_vacancy(self.company, skills="Python", end_date=date.today() - timedelta(days=1))
+
+    def slugs(self, vacancy):
+        return set(vacancy.skill_tags.values_list('slug', flat=True))
+
+    def test_skills_are_canonicalised_on_save(self):
+        self.assertEqual(self.slugs(self.django), {'django', 'python', 'kubernetes'})
+        self.assertEqual(self.slugs(self.node), {'node.js', 'javascript', 'postgresql'})
+        self.assertEqual(Skill.objects.get(slug='django').name, "Django")
+
+        self.django.skills = "Django, Go"
+        self.django.save()
+        self.assertEqual(self.slugs(self.django), {'django', 'go'})
+
+    def test_board_filters_by_skill_or_alias(self):
+        self.client.force_login(make_applicant().user)
+        response = self.client.get("/all_jobs/", {'skill': 'python'})
+        self.assertEqual(list(response.context['vacancies']), [self.django])
+        response = self.client.get("/all_jobs/", {'skill': ['js', 'django'], 'availability': ['open', 'closed']})
+        self.assertEqual({vacancy.pk for vacancy in response.context['vacancies']}, {self.django.pk, self.node.pk})
+        skills = {option['value']: option['count'] for option in response.context['facets'][-1]['options']}
+        self.assertEqual(skills['python'], 1)
+
+    def test_backfill_links_existing_vacancies_in_batches(self):
+        VacancySkill.objects.all().delete()
+        Vacancy.objects.bulk_create([Vacancy(title="Imported", company_name=self.company, salary=0,
+                                             company_logo="", description="", experience="", location="",
+                                             skills="Golang", start_date=date.today(), end_date=date.today())])
+        call_command("backfill_vacancy_skills", "--batch-size", "2", stdout=StringIO())
+        self.assertEqual(self.slugs(self.node), {'node.js', 'javascript', 'postgresql'})
+        self.assertEqual(self.slugs(Vacancy.objects.get(title="Imported")), {'go'})
+        self.assertEqual(VacancySkill.objects.count(), 8)
+
+
+@override_settings(AUTH_CACHE_TIMEOUT=300, SESSION_ENGINE="django.contrib.sessions.backends.cached_db")
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+        self.applicant = make_applicant()
+        self.company = make_recruiter(status="pending")
+
+    def tables(self, path):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(path).status_code, 200)
+        return {table for query in queries for table in ("django_session", "auth_user", "jobs_jobsearcher")
+                if 'FROM "%s"' % table in query["sql"]}
+
+    def test_warm_requests_skip_session_user_and_profile_queries(self):
+        response = self.client.post("/user_login/", {"username": self.applicant.user.username, "password": "secret"})
+        self.assertRedirects(response, "/user_homepage", fetch_redirect_response=False)
+        self.assertEqual(self.tables("/user_homepage/"), {"auth_user", "jobs_jobsearcher"})
+        self.assertEqual(self.tables("/user_homepage/"), set())
+
+    def test_deactivation_and_moderation_are_seen_at_once(self):
+        from jobs.deletion import soft_delete_applicant
+        from jobs.moderation import change_status
+
+        self.client.force_login(self.applicant.user)
+        self.client.get("/user_homepage/")
+        soft_delete_applicant(self.applicant)
+        self.assertEqual(self.client.get("/user_homepage/").status_code, 302)
+
+        credentials = {"username": self.company.user.username, "password": "secret"}
+        self.assertEqual(self.client.post("/company_login/", credentials).status_code, 200)
+        change_status(Recruiter.objects.filter(pk=self.company.pk), "Accepted")
+        self.assertRedirects(self.client.post("/company_login/", credentials), "/company_homepage",
+                             fetch_redirect_response=False)
+
+    def test_profile_edits_keep_the_image_stored_by_the_upload_worker(self):
+        self.client.force_login(self.applicant.user)
+        self.client.get("/user_homepage/")
+        JobSearcher.objects.filter(pk=self.applicant.pk).update(image="processed.png",
+                                                                upload_status=UploadStatus.ready.value)
+        self.client.post("/user_homepage/", {'email': "a@example.com", 'first_name': "A", 'last_name': "B",
+                                             'phone': "5550000", 'gender': "Female"})
+        self.applicant.refresh_from_db()
+        self.assertEqual((self.applicant.image.name, self.applicant.phone), ("processed.png", "5550000"))
+
+    def test_out_of_range_experience_is_rejected(self):
+        self.client.force_login(self.applicant.user)
+        response = self.client.post("/user_homepage/", {'email': "a@example.com", 'first_name': "A", 'last_name': "B",
+                                                        'phone': "5551111", 'gender': "Female", 'experience': "99999"})
+        self.assertEqual(response.status_code, 400)
+        self.applicant.refresh_from_db()
+        self.assertEqual((self.applicant.experience, self.applicant.phone), (None, "5550000"))
+
+    @override_settings(UPLOAD_WORKERS=0)
+    def test_processed_uploads_are_seen_at_once(self):
+        with tempfile.TemporaryDirectory() as media_root, self.settings(MEDIA_ROOT=media_root):
+            self.client.force_login(self.applicant.user)
+            self.client.get("/user_homepage/")
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post("/user_homepage/", {'email': "a@example.com", 'first_name': "A", 'last_name': "B",
+                                                     'phone': "5550000", 'gender': "Female", 'image': make_image()})
+            applicant = self.client.get("/user_homepage/").context['applicant']
+            self.assertEqual(applicant.upload_status, UploadStatus.ready.value)
+            self.assertTrue(applicant.image.name.endswith(".png"))
+
+
+@override_settings(RATE_LIMITS={'login': {'ip': (5, 60), 'account': (2, 60)}, 'apply': {'account': (1, 60)}})
+class RateLimitTests(TestCase):
+    def setUp(self):
+        from django.core.cache import cache
+
+        cache.clear()
+
+    def login(self, username, ip="10.0.0.1"):
+        return self.client.post("/user_login/", {"username": username, "password": "wrong"}, REMOTE_ADDR=ip)
+
+    def test_login_is_limited_per_account_and_ip_before_hashing(self):
+        from unittest import mock
+        from jobs.ratelimit import stats
+
+        with mock.patch("jobs.views.authenticate", return_value=None) as authenticate:
+            self.assertEqual(self.login("alice").status_code, 200)
+            self.assertEqual(self.login("ALICE ").status_code, 200)
+            response = self.login("alice")
+            self.assertEqual(response.status_code, 429)
+            self.assertIn(int(response["Retry-After"]), range(1, 121))
+            self.assertEqual(authenticate.call_count, 2)
+
+            self.assertEqual(self.login("alice", ip="10.0.0.2").status_code, 429)
+            # The rejected third attempt still counted against the IP bucket.
+            for name in ("bob", "carol"):
+                self.assertEqual(self.login(name).status_code, 200)
+            self.assertEqual(self.login("dave").status_code, 429)
+            self.assertEqual(authenticate.call_count, 4)
+        self.assertEqual(stats()["login"], {"ip": 1, "account": 2})
+
+    def test_buckets_refill_over_time(self):
+        from unittest import mock
+
+        with mock.patch("jobs.ratelimit.time.time", return_value=1000.0):
+            self.login("alice")
+            self.login("alice")
+            self.assertEqual(self.login("alice").status_code, 429)
+        # A new fixed window has started, but the last 60 seconds are still full.
+        with mock.patch("jobs.ratelimit.time.time", return_value=1030.0):
+            response = self.login("alice")
+            self.assertEqual((response.status_code, response["Retry-After"]), (429, "50"))
+        with mock.patch("jobs.ratelimit.time.time", return_value=1080.0):
+            self.assertEqual(self.login("alice").status_code, 200)
+
+    def test_no_double_burst_across_a_window_boundary(self):
+        from unittest import mock
+
+        with mock.patch("jobs.ratelimit.time.time", return_value=1019.0):
+            self.assertEqual(self.login("alice").status_code, 200)
+            self.assertEqual(self.login("alice").status_code, 200)
+        with mock.patch("jobs.ratelimit.time.time", return_value=1021.0):
+            self.assertEqual(self.login("alice").status_code, 429)
+
+    @override_settings(RATE_LIMIT_IP_HEADER="HTTP_X_FORWARDED_FOR")
+    def test_client_ip_ignores_forwarded_entries_added_by_the_client(self):
+        from django.test import RequestFactory
+        from jobs.ratelimit import client_ip
+
+        request = RequestFactory().post("/user_login/", HTTP_X_FORWARDED_FOR="1.1.1.1, 10.0.0.7, 203.0.113.9")
+        self.assertEqual(client_ip(request), "203.0.113.9")
+        with self.settings(RATE_LIMIT_TRUSTED_PROXIES=2):
+            self.assertEqual(client_ip(request), "10.0.0.7")
+
+    def test_apply_is_rejected_before_the_upload_is_read(self):
+        from unittest import mock
+
+        applicant = make_applicant()
+        vacancy = make_vacancy(make_recruiter())
+        other = make_vacancy(vacancy.company_name)
+        self.client.force_login(applicant.user)
+        resume = SimpleUploadedFile("resume.png", b"resume")
+        self.client.post("/job_apply/%d/" % vacancy.pk, {"resume": resume})
+        with mock.patch("django.http.request.HttpRequest._load_post_and_files") as load:
+            response = self.client.post("/job_apply/%d/" % other.pk, {"resume": resume})
+        self.assertEqual(response.status_code, 429)
+        load.assert_not_called()
+        self.assertFalse(Application.objects.filter(vacancy=other).exists())
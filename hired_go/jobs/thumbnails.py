@@ -0,0 +1,119 @@
+import logging
+import posixpath
+import threading
+from io import BytesIO
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.urls import reverse
+
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpg': ('JPEG', 'image/jpeg'),
+}
+
+THUMBNAIL_DIR = 'thumbs'
+
+# The image fields that get thumbnails; resumes and other uploads never do.
+THUMBNAIL_FIELDS = (
+    ('jobs.JobSearcher', 'image'),
+    ('jobs.Recruiter', 'image'),
+    ('jobs.Vacancy', 'company_logo'),
+)
+
+# Derived images live under MEDIA_ROOT/thumbs with predictable names, outside
+# the content-addressed default storage that holds the originals.
+derived_storage = FileSystemStorage()
+
+# Renders of one thumbnail are serialised on a fixed pool of striped locks,
+# so memory stays bounded however many thumbnails are requested.
+LOCK_STRIPES = 64
+_locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+
+
+def sizes():
+    return settings.THUMBNAIL_SIZES
+
+
+def negotiate_format(request):
+    return 'webp' if 'image/webp' in request.headers.get('Accept', '') else 'jpg'
+
+
+def thumbnail_name(name, size, image_format):
+    return posixpath.join(THUMBNAIL_DIR, size, '%s.%s' % (name, image_format))
+
+
+def thumbnail_url(name, size):
+    if not name:
+        return ''
+    return reverse('thumbnail', args=[size, name])
+
+
+def has_thumbnails(name):
+    """Whether ``name`` is stored in one of the THUMBNAIL_FIELDS."""
+    return any(apps.get_model(label).objects.filter(**{field_name: name}).exists()
+               for label, field_name in THUMBNAIL_FIELDS)
+
+
+def _lock(key):
+    return _locks[hash(key) % LOCK_STRIPES]
+
+
+def _render(name, size, image_format):
+    from PIL import Image, ImageOps
+
+    with default_storage.open(name, 'rb') as original, Image.open(original) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail(sizes()[size])
+        if image_format == 'jpg' and image.mode != 'RGB':
+            background = Image.new('RGB', image.size, 'white')
+            background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+            image = background
+        buffer = BytesIO()
+        image.save(buffer, FORMATS[image_format][0], quality=80, optimize=True)
+    return buffer.getvalue()
+
+
+def get_thumbnail(name, size, image_format):
+    """
+    Return the storage name of the ``size`` thumbnail of ``name`` in
+    ``image_format``, rendering and storing it on first use. Returns None
+    when the original is missing, is not a profile image or logo, or is not
+    a readable image.
+    """
+    if size not in sizes() or image_format not in FORMATS:
+        return None
+    derived = thumbnail_name(name, size, image_format)
+    try:
+        if derived_storage.exists(derived):
+            return derived
+        if not default_storage.exists(name) or not has_thumbnails(name):
+            return None
+    except SuspiciousFileOperation:
+        return None
+    with _lock(derived):
+        if derived_storage.exists(derived):
+            return derived
+        try:
+            content = _render(name, size, image_format)
+        except Exception:
+            logger.warning("Could not render %s thumbnail of %s", size, name, exc_info=True)
+            return None
+        derived_storage.save(derived, ContentFile(content))
+    return derived
+
+
+def pregenerate(instance, field_name):
+    """Upload post-processor: render every size and format of a new profile image or logo."""
+    if (instance._meta.label, field_name) not in THUMBNAIL_FIELDS:
+        return
+    name = getattr(instance, field_name).name
+    for size in sizes():
+        for image_format in FORMATS:
+            get_thumbnail(name, size, image_format)
@@ -0,0 +1,217 @@
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.apps import apps
+from django.conf import settings
+from django.core.files import File
+from django.db import close_old_connections, transaction
+
+from .models import UploadStatus
+from .profiles import forget
+
+
+logger = logging.getLogger(__name__)
+
+# Callables run as ``processor(instance, field_name)`` after an upload has been
+# validated and stored, e.g. to pre-generate derived images.
+POST_PROCESSORS = []
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = set()
+
+# EXIF tag holding the camera orientation.
+ORIENTATION = 0x0112
+
+# Staged files are named '<app.model>__<pk>__<field>__<token>.<ext>', so
+# recover_stale_uploads() can tell which row a leftover file belongs to.
+STAGED_NAME_RE = re.compile(r'^(?P<label>\w+\.\w+)__(?P<pk>\d+)__(?P<field>\w+?)__[0-9a-f]{32}\b')
+
+
+def staging_dir():
+    path = getattr(settings, 'UPLOAD_STAGING_DIR', os.path.join(settings.MEDIA_ROOT, 'staging'))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def stage(upload, instance, field_name):
+    """
+    Move an uploaded file into the staging area. Large uploads already sit in
+    a temporary file, so this is a rename; small ones are held in memory.
+    """
+    extension = os.path.splitext(upload.name)[1].lower()
+    name = '%s__%s__%s__%s%s' % (instance._meta.label_lower, instance.pk, field_name, uuid.uuid4().hex, extension)
+    path = os.path.join(staging_dir(), name)
+    if hasattr(upload, 'temporary_file_path'):
+        upload.close()
+        shutil.move(upload.temporary_file_path(), path)
+    else:
+        with open(path, 'wb') as staged:
+            for chunk in upload.chunks():
+                staged.write(chunk)
+    return path
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.UPLOAD_WORKERS,
+                                               thread_name_prefix='upload-worker')
+    return _executor
+
+
+def _normalise(path):
+    """Validate an image and shrink it to UPLOAD_MAX_DIMENSION; return (path, extension)."""
+    from PIL import Image, ImageOps
+
+    with Image.open(path) as image:
+        image.verify()
+    with Image.open(path) as image:
+        # exif_transpose() returns a copy without ``format``, so decide first.
+        source_format = image.format
+        rotated = image.getexif().get(ORIENTATION, 1) != 1
+        limit = getattr(settings, 'UPLOAD_MAX_DIMENSION', 1600)
+        if max(image.size) <= limit and not rotated and source_format in ('JPEG', 'PNG', 'WEBP'):
+            return path, '.' + source_format.lower().replace('jpeg', 'jpg')
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((limit, limit))
+        if image.mode in ('RGBA', 'LA', 'P'):
+            extension, image_format = '.png', 'PNG'
+        else:
+            extension, image_format = '.jpg', 'JPEG'
+            image = image.convert('RGB')
+        normalised = os.path.splitext(path)[0] + '.normalised' + extension
+        image.save(normalised, image_format, optimize=True, quality=85)
+    os.remove(path)
+    return normalised, extension
+
+
+def _save(instance, fields):
+    # A real save, not a queryset update, so post_save receivers drop cached
+    # pages and profiles and Vacancy.updated_at (the job detail ETag) moves.
+    if any(field.name == 'updated_at' for field in instance._meta.concrete_fields):
+        fields = fields + ['updated_at']
+    instance.save(update_fields=fields)
+    _forget_profile(instance)
+
+
+def _forget_profile(instance):
+    # Profiles (and the AddJobView logo copied from them) are served from the
+    # auth cache, so drop it whenever the image or its status changes.
+    if getattr(instance, 'user_id', None) is not None:
+        forget(instance.user_id)
+
+
+def process(model_label, pk, field_name, path):
+    model = apps.get_model(model_label)
+    try:
+        instance = model.objects.filter(pk=pk).first()
+        if instance is None:
+            return
+        try:
+            path, extension = _normalise(path)
+        except Exception:
+            logger.warning("Rejected upload for %s %s.%s", model_label, pk, field_name, exc_info=True)
+            instance.upload_status = UploadStatus.failed.value
+            _save(instance, ['upload_status'])
+            return
+
+        field_file = getattr(instance, field_name)
+        with open(path, 'rb') as staged:
+            field_file.save(uuid.uuid4().hex + extension, File(staged), save=False)
+        instance.upload_status = UploadStatus.ready.value
+        _save(instance, [field_name, 'upload_status'])
+        for processor in POST_PROCESSORS:
+            processor(instance, field_name)
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _process_in_worker(*job):
+    # Worker threads keep their own connections; inline runs must leave the
+    # caller's connection (and its transaction) alone.
+    close_old_connections()
+    try:
+        process(*job)
+    finally:
+        close_old_connections()
+
+
+def process_later(instance, field_name, upload):
+    """
+    Stage ``upload`` and have a background worker validate, normalise and
+    store it in ``instance.<field_name>`` once the current transaction commits.
+    The instance is marked pending until the worker finishes.
+    """
+    path = stage(upload, instance, field_name)
+    type(instance).objects.filter(pk=instance.pk).update(upload_status=UploadStatus.pending.value)
+    instance.upload_status = UploadStatus.pending.value
+    _forget_profile(instance)
+    job = (instance._meta.label, instance.pk, field_name, path)
+
+    def submit():
+        if not settings.UPLOAD_WORKERS:
+            process(*job)
+            return
+        future = _get_executor().submit(_process_in_worker, *job)
+        _pending.add(future)
+        future.add_done_callback(_pending.discard)
+
+    transaction.on_commit(submit)
+
+
+def wait_for_uploads(timeout=None):
+    for future in list(_pending):
+        future.result(timeout=timeout)
+
+
+def recover_stale_uploads(older_than=3600):
+    """
+    Finish uploads a stopped process left behind. Staged files older than
+    ``older_than`` seconds are processed if their row is still pending and
+    deleted otherwise; pending rows with no staged file left are marked
+    failed. Returns (processed, removed, failed) counts.
+    """
+    directory = staging_dir()
+    cutoff = time.time() - older_than
+    processed = removed = 0
+    staged = set()
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        match = STAGED_NAME_RE.match(name)
+        if match:
+            staged.add((match['label'], int(match['pk'])))
+        if not os.path.isfile(path) or os.path.getmtime(path) > cutoff:
+            continue
+        model = None
+        if match:
+            try:
+                model = apps.get_model(match['label'])
+            except LookupError:
+                pass
+        if model is not None and model.objects.filter(pk=match['pk'],
+                                                      upload_status=UploadStatus.pending.value).exists():
+            process(match['label'], match['pk'], match['field'], path)
+            processed += 1
+        else:
+            os.remove(path)
+            removed += 1
+    failed = 0
+    for model in apps.get_app_config('jobs').get_models():
+        if not any(field.name == 'upload_status' for field in model._meta.concrete_fields):
+            continue
+        for instance in model.objects.filter(upload_status=UploadStatus.pending.value):
+            if (model._meta.label_lower, instance.pk) not in staged:
+                instance.upload_status = UploadStatus.failed.value
+                _save(instance, ['upload_status'])
+                failed += 1
+    return processed, removed, failed
@@ -1,5 +1,13 @@
-from django.urls import path
-from . import views
+from django.urls import include, path
+from rest_framework.routers import DefaultRouter
+
+from . import api, views
+
+
+router = DefaultRouter()
+router.register("vacancies", api.VacancyViewSet, basename="api-vacancy")
+router.register("recruiters", api.RecruiterViewSet, basename="api-recruiter")
+router.register("applications", api.ApplicationViewSet, basename="api-application")
 
 
 urlpatterns = [
@@ -10,6 +18,7 @@ urlpatterns = [
     path("user_homepage/", views.UserHomepageView.as_view(), name="user_homepage"),
     path("logout/", views.LogoutView.as_view(), name="logout"),
     path("all_jobs/", views.AllJobsView.as_view(), name="all_jobs"),
+    path("search/", views.JobSearchView.as_view(), name="job_search"),
     path("job_detail/<int:pk>/", views.JobDetailView.as_view(), name="job_detail"),
     path("job_apply/<int:pk>/", views.JobApplyView.as_view(), name="job_apply"),
 
@@ -18,19 +27,31 @@ urlpatterns = [
     path("company_login/", views.CompanyLoginView.as_view(), name="company_login"),
     path("company_homepage/", views.CompanyHomepageView.as_view(), name="company_homepage"),
     path("add_job/", views.AddJobView.as_view(), name="add_job"),
+    path("import_jobs/", views.ImportJobsView.as_view(), name="import_jobs"),
     path("job_list/", views.JobListView.as_view(), name="job_list"),
     path("edit_job/<int:pk>/", views.EditJobView.as_view(), name="edit_job"),
     path("company_logo/<int:pk>/", views.CompanyLogoView.as_view(), name="company_logo"),
     path("all_applicants/", views.AllApplicantsView.as_view(), name="all_applicants"),
+    path("export/applications/", views.ApplicationExportView.as_view(), name="export_applications"),
 
     # admin
     path("admin_login/", views.AdminLoginView.as_view(), name="admin_login"),
     path("view_applicants/", views.ApplicantListView.as_view(), name="view_applicants"),
     path("delete_applicant/<int:pk>/", views.ApplicantDeleteView.as_view(), name="delete_applicant"),
+    path("export/applicants/", views.ApplicantExportView.as_view(), name="export_applicants"),
     path("pending_companies/", views.PendingCompaniesListView.as_view(), name="pending_companies"),
+    path("moderate_companies/", views.ModerateCompaniesView.as_view(), name="moderate_companies"),
     path("accepted_companies/", views.AcceptedCompaniesListView.as_view(), name="accepted_companies"),
     path("rejected_companies/", views.RejectedCompaniesView.as_view(), name="rejected_companies"),
     path("all_companies/", views.AllCompaniesView.as_view(), name="all_companies"),
     path("change_status/<int:pk>/", views.ChangeStatusView.as_view(), name="change_status"),
     path("delete_company/<int:pk>/", views.DeleteCompanyView.as_view(), name="delete_company"),
+    path("cache_stats/", views.CacheStatsView.as_view(), name="cache_stats"),
+    path("rate_limit_stats/", views.RateLimitStatsView.as_view(), name="rate_limit_stats"),
+
+    # Derived images
+    path("thumbs/<str:size>/<path:name>", views.ThumbnailView.as_view(), name="thumbnail"),
+
+    # API
+    path("api/", include(router.urls)),
 ]
@@ -1,28 +1,71 @@
+import csv
+import os
 from datetime import date
 
+from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.contrib.auth.views import LogoutView, LoginView
+from django.contrib.auth.views import LogoutView, LoginView, redirect_to_login
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.storage import default_storage
+from django.core.handlers.asgi import ASGIRequest
+from django.core.paginator import Paginator
+from django.db.models import Exists, OuterRef, Q
+from django.http import Http404, HttpResponse, HttpResponseBadRequest, JsonResponse
+from django.template.loader import render_to_string
+
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
 from django.utils.decorators import method_decorator
+from django.utils.http import http_date
 from django.shortcuts import render, redirect, get_object_or_404
-from django.urls import reverse_lazy
 from django.views import View
-from django.views.generic import ListView, UpdateView, DeleteView
+from django.views.generic import ListView, UpdateView
 
+from .cache import acached_fragment, aget_versions, stats as cache_stats
+from .dashboard import company_dashboard
+from .deletion import soft_delete_applicant, soft_delete_company
+from .exports import APPLICANT_COLUMNS, APPLICATION_COLUMNS, FORMATS as EXPORT_FORMATS, export_response
+from .facets import afacet_counts, filter_query, filter_vacancies, selected_filters
 from .forms import VacancyForm
 from .models import *
+from .imports import import_vacancies, read_rows
+from .moderation import change_status
+from .pagination import KeysetPaginator, get_page_size
+from .profiles import arequest_profile, get_profile, login_profile, request_profile
+from .ranking import mark_unscored
+from .ratelimit import stats as rate_limit_stats
+from .recommendations import recommend
+from .search import search_vacancies
+from .storage import HASHED_NAME, sendfile_response
+from .thumbnails import FORMATS as THUMBNAIL_FORMATS, derived_storage, get_thumbnail, has_thumbnails, negotiate_format
+from .uploads import process_later
+
+
+async def _auser(request):
+    # request.user is loaded lazily from the session and auth tables, which
+    # must not happen on the event loop.
+    await sync_to_async(lambda: request.user.is_authenticated)()
+    return request.user
 
 
 class IndexView(View):
-    def get(self, request):
-        return render(request, "index.html")
+    async def get(self, request):
+        if (await _auser(request)).is_authenticated:
+            return render(request, "index.html")
+
+        async def render_index():
+            return render_to_string("index.html", request=request)
+
+        return HttpResponse(await acached_fragment('index', await aget_versions('site'), render_index))
 
 
 class UserLoginView(View):
+    rate_limit = 'login'
+
     def get(self, request):
         if request.user.is_authenticated:
             return redirect("/")
@@ -36,9 +79,9 @@ class UserLoginView(View):
         user = authenticate(username=username, password=password)
 
         if user is not None:
-            user1 = JobSearcher.objects.get(user=user)
-            if user1.type == "applicant":
-                login(request, user)
+            profile = get_profile(user)
+            if isinstance(profile, JobSearcher) and profile.type == "applicant":
+                login_profile(request, user, profile)
                 return redirect("/user_homepage")
         else:
             thank = True
@@ -47,10 +90,14 @@ class UserLoginView(View):
 
 
 class UserHomepageView(View):
+    # Years; also keeps the value inside the smallint column on every backend.
+    max_experience = 70
+
     @method_decorator(login_required)
     def get(self, request):
-        applicant = JobSearcher.objects.get(user=request.user)
-        return render(request, "user_homepage.html", {'applicant': applicant})
+        applicant = request_profile(request, JobSearcher)
+        return render(request, "user_homepage.html", {'applicant': applicant,
+                                                      'recommendations': recommend(applicant)})
 
     @method_decorator(login_required)
     def post(self, request):
@@ -59,64 +106,131 @@ class UserHomepageView(View):
         last_name = request.POST['last_name']
         phone = request.POST['phone']
         gender = request.POST['gender']
-        applicant = JobSearcher.objects.get(user=request.user)
+        skills = request.POST.get('skills', '')
+        experience = request.POST.get('experience', '')
+        experience = int(experience) if experience.isdigit() else None
+        if experience is not None and experience > self.max_experience:
+            return HttpResponseBadRequest("Experience must be at most %d years." % self.max_experience)
+        applicant = request_profile(request, JobSearcher)
 
         applicant.user.email = email
         applicant.user.first_name = first_name
         applicant.user.last_name = last_name
         applicant.phone = phone
         applicant.gender = gender
-        applicant.save()
-        applicant.user.save()
+        if (skills, experience) != (applicant.skills, applicant.experience):
+            mark_unscored(applicant=applicant)
+        applicant.skills = skills
+        applicant.experience = experience
+        # Only the edited fields: the image and upload status are written by the upload worker.
+        applicant.save(update_fields=['phone', 'gender', 'skills', 'experience'])
+        applicant.user.save(update_fields=['email', 'first_name', 'last_name'])
 
-        try:
-            image = request.FILES['image']
-            applicant.image = image
-            applicant.save()
-        except:
-            pass
+        image = request.FILES.get('image')
+        if image:
+            process_later(applicant, 'image', image)
         alert = True
         return render(request, "user_homepage.html", {'alert': alert, 'applicant': applicant})
 
 
 class AllJobsView(View):
-    @method_decorator(login_required)
-    def get(self, request):
-        vacancies = Vacancy.objects.all().order_by('-start_date')
-        applicant = JobSearcher.objects.get(user=request.user)
-        apply = Application.objects.filter(applicant=applicant)
-        data = []
-        for i in apply:
-            data.append(i.vacancy.id)
-        return render(request, "all_jobs.html", {'vacancies': vacancies, 'data': data})
+    async def get(self, request):
+        user = await _auser(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        applicant = await arequest_profile(request, JobSearcher)
+        selected = selected_filters(request.GET)
+        page_size = get_page_size(request)
+        after, before = request.GET.get('after'), request.GET.get('before')
+
+        async def render_board():
+            vacancies = filter_vacancies(Vacancy.objects.select_related('company_name'), selected).annotate(
+                applied=Exists(Application.objects.filter(applicant=applicant, vacancy=OuterRef('pk'))))
+            page = await KeysetPaginator(vacancies, page_size).apage(after=after, before=before)
+            return render_to_string("job_board_table.html", {'vacancies': page, 'page': page, 'page_size': page_size,
+                                                             'filter_query': filter_query(selected)})
+
+        versions = await aget_versions('vacancies', 'recruiters', 'applicant:%s' % applicant.pk)
+        board = await acached_fragment('job_board', versions + [applicant.pk, date.today(), filter_query(selected),
+                                                                after, before, page_size], render_board)
+        return render(request, "all_jobs.html", {'board': board, 'page_size': page_size,
+                                                 'facets': await afacet_counts(selected)})
+
+
+class JobSearchView(View):
+    async def get(self, request):
+        user = await _auser(request)
+        if not user.is_authenticated:
+            return redirect_to_login(request.get_full_path())
+        query = request.GET.get('q', '').strip()
+        page_size = get_page_size(request)
+        # The Postgres backend returns a lazy queryset; evaluate it off the event loop.
+        ids = await sync_to_async(lambda: list(search_vacancies(query)))() if query else []
+        page = Paginator(ids, page_size).get_page(request.GET.get('page'))
+        applicant = await arequest_profile(request, JobSearcher)
+        found = await (Vacancy.objects.filter(id__in=list(page.object_list)).select_related('company_name')
+                       .annotate(applied=Exists(Application.objects.filter(applicant=applicant,
+                                                                           vacancy=OuterRef('pk'))))
+                       .ain_bulk())
+        vacancies = [found[pk] for pk in page.object_list if pk in found]
+        return render(request, "job_search.html", {'vacancies': vacancies, 'page': page, 'page_size': page_size,
+                                                   'query': query})
 
 
 class JobDetailView(View):
-    def get(self, request, pk):
-        job = Vacancy.objects.get(id=pk)
-        return render(request, "job_detail.html", {'job': job})
+    async def get(self, request, pk):
+        user = await _auser(request)
+        try:
+            updated_at = await Vacancy.objects.values_list('updated_at', flat=True).aget(id=pk)
+        except Vacancy.DoesNotExist:
+            raise Http404("Vacancy not found.")
+        last_modified = int(updated_at.timestamp())
+        etag = '"%s-%s"' % (pk, int(updated_at.timestamp() * 1000000))
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            async def render_detail():
+                job = await Vacancy.objects.select_related('company_name').aget(id=pk)
+                return render_to_string("job_detail_content.html", {'job': job})
+
+            content = await acached_fragment('job_detail', [pk, etag], render_detail)
+            response = render(request, "job_detail.html", {'content': content})
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified)
+        if user.is_authenticated:
+            patch_cache_control(response, private=True, max_age=0, must_revalidate=True)
+        else:
+            patch_cache_control(response, public=True, max_age=settings.JOB_DETAIL_MAX_AGE)
+        return response
 
 
 @method_decorator(login_required(login_url='/user_login'), name='dispatch')
 class JobApplyView(View):
+    rate_limit = 'apply'
+
     def get(self, request, pk):
-        applicant = JobSearcher.objects.get(user=request.user)
+        applicant = request_profile(request, JobSearcher)
         vacancy = Vacancy.objects.get(id=pk)
-        if vacancy.end_date < date.today():
+        status = vacancy.current_status()
+        if status == VacancyStatus.closed.value:
             closed = True
             return render(request, "job_apply.html", {'closed': closed})
-        elif vacancy.start_date > date.today():
+        elif status == VacancyStatus.upcoming.value:
             not_open = True
             return render(request, "job_apply.html", {'notopen': not_open})
         else:
             return render(request, "job_apply.html", {'job': vacancy})
 
     def post(self, request, pk):
-        applicant = JobSearcher.objects.get(user=request.user)
+        applicant = request_profile(request, JobSearcher)
         vacancy = Vacancy.objects.get(id=pk)
         resume = request.FILES['resume']
-        Application.objects.create(
-            vacancy=vacancy, company=vacancy.company_name, applicant=applicant, resume=resume, application_date=date.today())
+        application, created = Application.objects.get_or_create(
+            vacancy=vacancy, applicant=applicant,
+            defaults={'company': vacancy.company_name, 'application_date': date.today()})
+        if created:
+            process_later(application, 'resume', resume)
         alert = True
         return render(request, "job_apply.html", {'alert': alert})
 
@@ -124,12 +238,40 @@ class JobApplyView(View):
 class AllApplicantsView(View):
     @method_decorator(login_required)
     def get(self, request):
-        recruiter = Recruiter.objects.get(user=request.user)
-        application = Application.objects.filter(company=recruiter)
-        return render(request, "all_applicants.html", {'application': application})
+        recruiter = request_profile(request, Recruiter)
+        applications = Application.objects.filter(company=recruiter).select_related('vacancy', 'applicant__user')
+        vacancy = request.GET.get('vacancy', '')
+        if vacancy.isdigit():
+            applications = applications.filter(vacancy_id=vacancy)
+        else:
+            vacancy = ''
+        # Served best match first from the stored scores and the (company|vacancy, -score, -id) indexes.
+        page_size = get_page_size(request)
+        page = KeysetPaginator(applications, page_size, keys=('score', 'id')).page(
+            after=request.GET.get('after'), before=request.GET.get('before'))
+        vacancies = Vacancy.objects.filter(company_name=recruiter).only('id', 'title').order_by('title')
+        return render(request, "all_applicants.html", {'application': page, 'page': page, 'page_size': page_size,
+                                                       'vacancies': vacancies, 'vacancy': vacancy})
+
+
+class ApplicationExportView(View):
+    def get(self, request):
+        if not request.user.is_authenticated:
+            return redirect("/company_login")
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest("Unsupported export format.")
+        applications = Application.objects.all()
+        if not request.user.is_superuser:
+            recruiter = request_profile(request, Recruiter)
+            applications = applications.filter(company=recruiter)
+        return export_response(applications, APPLICATION_COLUMNS, "applications", export_format,
+                               spool=isinstance(request, ASGIRequest))
 
 
 class SignUpView(View):
+    rate_limit = 'signup'
+
     def get(self, request):
         return render(request, 'signup.html')
 
@@ -151,13 +293,13 @@ class SignUpView(View):
                                         password=password1)
         applicants = JobSearcher.objects.create(user=user, phone=phone, gender=gender, type="applicant")
         if image:
-            applicants.image = image
-        user.save()
-        applicants.save()
+            process_later(applicants, 'image', image)
         return render(request, "user_login.html")
 
 
 class CompanySignUpView(View):
+    rate_limit = 'signup'
+
     def get(self, request):
         return render(request, 'company_signup.html')
 
@@ -179,14 +321,15 @@ class CompanySignUpView(View):
 
         user = User.objects.create_user(first_name=first_name, last_name=last_name, email=email, username=username,
                                         password=password1)
-        company = Recruiter.objects.create(user=user, phone=phone, gender=gender, image=image, company_name=company_name,
+        company = Recruiter.objects.create(user=user, phone=phone, gender=gender, company_name=company_name,
                                             type="company", status="pending")
-        user.save()
-        company.save()
+        process_later(company, 'image', image)
         return render(request, "company_login.html")
 
 
 class CompanyLoginView(View):
+    rate_limit = 'login'
+
     def get(self, request):
         return render(request, 'company_login.html')
 
@@ -196,26 +339,27 @@ class CompanyLoginView(View):
         user = authenticate(username=username, password=password)
 
         if user is not None:
-            user1 = Recruiter.objects.get(user=user)
-            if user1.type == "company" and user1.status != "pending":
-                login(request, user)
+            profile = get_profile(user)
+            if isinstance(profile, Recruiter) and profile.type == "company" and profile.status != "pending":
+                login_profile(request, user, profile)
                 return redirect("/company_homepage")
         else:
             alert = True
             return render(request, "company_login.html", {"alert": alert})
+        return render(request, "company_login.html")
 
 
 class CompanyHomepageView(View):
     def get(self, request):
         if not request.user.is_authenticated:
             return redirect("/company_login")
-        company = Recruiter.objects.get(user=request.user)
-        return render(request, "company_homepage.html", {'company': company})
+        company = request_profile(request, Recruiter)
+        return render(request, "company_homepage.html", {'company': company, 'dashboard': company_dashboard(company)})
 
     def post(self, request):
         if not request.user.is_authenticated:
             return redirect("/company_login")
-        company = Recruiter.objects.get(user=request.user)
+        company = request_profile(request, Recruiter)
         email = request.POST.get('email')
         first_name = request.POST.get('first_name')
         last_name = request.POST.get('last_name')
@@ -227,15 +371,12 @@ class CompanyHomepageView(View):
         company.user.last_name = last_name
         company.phone = phone
         company.gender = gender
-        company.save()
-        company.user.save()
+        company.save(update_fields=['phone', 'gender'])
+        company.user.save(update_fields=['email', 'first_name', 'last_name'])
 
-        try:
-            image = request.FILES['image']
-            company.image = image
-            company.save()
-        except:
-            pass
+        image = request.FILES.get('image')
+        if image:
+            process_later(company, 'image', image)
         alert = True
         return render(request, "company_homepage.html", {'alert': alert})
 
@@ -266,22 +407,42 @@ class AddJobView(View):
         location = request.POST.get('location')
         skills = request.POST.get('skills')
         description = request.POST.get('description')
-        user = request.user
-        company = Recruiter.objects.get(user=user)
-        job = Vacancy.objects.create(company_name=company, title=title, start_date=start_date, end_date=end_date,
-                                     salary=salary, tech_stack=tech_stack, vacancy_type=vacancy_type,
-                                     company_logo=company.image, experience=experience, location=location, skills=skills,
-                                     description=description, creation_date=date.today())
-        job.save()
+        company = request_profile(request, Recruiter)
+        Vacancy.objects.create(company_name=company, title=title, start_date=start_date, end_date=end_date,
+                               salary=salary, tech_stack=tech_stack, vacancy_type=vacancy_type,
+                               company_logo=company.image, experience=experience, location=location, skills=skills,
+                               description=description, creation_date=date.today())
         alert = True
         return render(request, "add_job.html", {'alert': alert})
 
 
+class ImportJobsView(View):
+    def get(self, request):
+        if not request.user.is_authenticated:
+            return redirect("/company_login")
+        return render(request, "import_jobs.html")
+
+    def post(self, request):
+        if not request.user.is_authenticated:
+            return redirect("/company_login")
+        company = request_profile(request, Recruiter)
+        upload = request.FILES.get('file')
+        if upload is None:
+            messages.error(request, "Please choose a CSV or JSON file.")
+            return render(request, "import_jobs.html")
+        try:
+            result = import_vacancies(company, read_rows(upload, upload.name), strict=bool(request.POST.get('strict')))
+        except (ValueError, UnicodeDecodeError, csv.Error) as exc:
+            messages.error(request, "Could not read the file: %s" % exc)
+            return render(request, "import_jobs.html")
+        return render(request, "import_jobs.html", {'result': result, 'errors': result.errors[:200]})
+
+
 class JobListView(View):
     def get(self, request):
         if not request.user.is_authenticated:
             return redirect("/company_login")
-        companies = Recruiter.objects.get(user=request.user)
+        companies = request_profile(request, Recruiter)
         jobs = Vacancy.objects.filter(company_name=companies)
         return render(request, "job_list.html", {'jobs': jobs})
 
@@ -309,20 +470,19 @@ class EditJobView(View):
 
 
 class CompanyLogoView(View):
-    def get(self, request, myid):
+    def get(self, request, pk):
         if not request.user.is_authenticated:
             return redirect("/company_login")
-        job = Vacancy.objects.get(id=myid)
+        job = Vacancy.objects.get(id=pk)
         return render(request, "company_logo.html", {'job': job})
 
-    def post(self, request, myid):
+    def post(self, request, pk):
         if not request.user.is_authenticated:
             return redirect("/company_login")
-        job = Vacancy.objects.get(id=myid)
+        job = Vacancy.objects.get(id=pk)
         image = request.FILES.get('logo')
         if image:
-            job.image = image
-            job.save()
+            process_later(job, 'company_logo', image)
             alert = True
             return render(request, "company_logo.html", {'job': job, 'alert': alert})
         else:
@@ -334,6 +494,7 @@ class UserLogoutView(LogoutView):
 
 
 class AdminLoginView(LoginView):
+    rate_limit = 'login'
     template_name = 'admin_login.html'
 
     def form_valid(self, form):
@@ -350,36 +511,78 @@ class ApplicantListView(LoginRequiredMixin, ListView):
     model = JobSearcher
     template_name = 'view_applicants.html'
     context_object_name = 'applicants'
+    queryset = JobSearcher.objects.select_related('user')
 
 
-class ApplicantDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
-    model = User
-    template_name = 'applicant_confirm_delete.html'
-    success_url = reverse_lazy('applicant_list')
+class ApplicantExportView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def get(self, request):
+        export_format = request.GET.get('format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return HttpResponseBadRequest("Unsupported export format.")
+        return export_response(JobSearcher.objects.all(), APPLICANT_COLUMNS, "applicants", export_format,
+                               spool=isinstance(request, ASGIRequest))
+
 
+class ApplicantDeleteView(LoginRequiredMixin, UserPassesTestMixin, View):
     def test_func(self):
         return self.request.user.is_superuser
 
+    def post(self, request, pk):
+        soft_delete_applicant(get_object_or_404(JobSearcher, id=pk))
+        return redirect("view_applicants")
+
 
 class PendingCompaniesListView(LoginRequiredMixin, ListView):
     model = Recruiter
     template_name = 'pending_companies.html'
     context_object_name = 'companies'
-    queryset = Recruiter.objects.filter(status='pending')
+    queryset = Recruiter.objects.filter(status='pending').select_related('user').order_by('id')
+
+    def get_paginate_by(self, queryset):
+        return get_page_size(self.request)
+
+
+class ModerateCompaniesView(LoginRequiredMixin, UserPassesTestMixin, View):
+    login_url = '/admin_login'
 
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def post(self, request):
+        if request.POST.get('scope') == 'all':
+            companies = Recruiter.objects.filter(status='pending')
+        else:
+            ids = [pk for pk in request.POST.getlist('company') if pk.isdigit()]
+            companies = Recruiter.objects.filter(id__in=ids)
+        status = request.POST.get('status')
+        try:
+            changed = change_status(companies, status, moderator=request.user)
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+        messages.success(request, "%d companies marked %s." % (changed, status))
+        return redirect("pending_companies")
 
-class ChangeStatusView(LoginRequiredMixin, View):
+
+class ChangeStatusView(LoginRequiredMixin, UserPassesTestMixin, View):
     login_url = '/admin_login'
 
+    def test_func(self):
+        return self.request.user.is_superuser
+
     def get(self, request, pk):
         company = get_object_or_404(Recruiter, id=pk)
         return render(request, "change_status.html", {'company': company})
 
     def post(self, request, pk):
         company = get_object_or_404(Recruiter, id=pk)
-        status = request.POST['status']
-        company.status = status
-        company.save()
+        try:
+            change_status(Recruiter.objects.filter(id=pk), request.POST['status'], moderator=request.user)
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+        company.refresh_from_db()
         alert = True
         return render(request, "change_status.html", {'company': company, 'alert': alert})
 
@@ -388,23 +591,88 @@ class AcceptedCompaniesListView(LoginRequiredMixin, ListView):
     model = Recruiter
     template_name = 'accepted_companies.html'
     context_object_name = 'companies'
-    queryset = Recruiter.objects.filter(status='Accepted')
+    queryset = Recruiter.objects.filter(status='Accepted').select_related('user')
 
 
 class RejectedCompaniesView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
-        companies = Recruiter.objects.filter(status="Rejected")
+        companies = Recruiter.objects.filter(status="Rejected").select_related('user')
         return render(request, "rejected_companies.html", {'companies': companies})
 
 
 class AllCompaniesView(LoginRequiredMixin, View):
     def get(self, request, *args, **kwargs):
-        companies = Recruiter.objects.all()
+        companies = Recruiter.objects.select_related('user')
         return render(request, "all_companies.html", {'companies': companies})
 
 
-class DeleteCompanyView(LoginRequiredMixin, View):
-    def get(self, request, myid, *args, **kwargs):
-        company = Recruiter.objects.get(id=myid)
-        company.delete()
+class CacheStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def get(self, request):
+        return JsonResponse(cache_stats())
+
+
+class RateLimitStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def get(self, request):
+        return JsonResponse(rate_limit_stats())
+
+
+class ThumbnailView(View):
+    def get(self, request, size, name):
+        image_format = negotiate_format(request)
+        derived = get_thumbnail(name, size, image_format)
+        if derived is None:
+            raise Http404
+        response = sendfile_response(derived_storage.path(derived), THUMBNAIL_FORMATS[image_format][1])
+        patch_cache_control(response, public=True, max_age=settings.THUMBNAIL_MAX_AGE, immutable=True)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+
+class MediaView(View):
+    """
+    Profile images and logos are public. A resume is only served to its
+    applicant, the company it was sent to and superusers; other files are not
+    served at all.
+    """
+
+    def can_view_resume(self, request, name):
+        user = request.user
+        if not user.is_authenticated:
+            return False
+        return user.is_superuser or Application.objects.filter(
+            Q(applicant__user=user) | Q(company__user=user), resume=name).exists()
+
+    def get(self, request, name):
+        try:
+            path = default_storage.path(name)
+        except SuspiciousFileOperation:
+            raise Http404
+        if not os.path.isfile(path):
+            raise Http404
+        public = has_thumbnails(name)
+        if not public and not self.can_view_resume(request, name):
+            raise Http404
+        # If-Modified-Since has whole seconds only.
+        response = get_conditional_response(request, last_modified=int(os.path.getmtime(path)))
+        if response is None:
+            response = sendfile_response(path)
+        if not public:
+            patch_cache_control(response, private=True)
+        elif HASHED_NAME.match(name):
+            patch_cache_control(response, public=True, max_age=settings.THUMBNAIL_MAX_AGE, immutable=True)
+        return response
+
+
+class DeleteCompanyView(LoginRequiredMixin, UserPassesTestMixin, View):
+    def test_func(self):
+        return self.request.user.is_superuser
+
+    def post(self, request, pk, *args, **kwargs):
+        soft_delete_company(get_object_or_404(Recruiter, id=pk))
         return redirect("all_companies")